@@ -2,6 +2,10 @@
 import os
 import shutil
 import PyInstaller.__main__
+import reportlab
+
+# cetak._Pdf._tutup_halaman memakai bagian internal reportlab; versi lain harus dicoba dulu
+REPORTLAB_VERSI = "5.0.1"
 
 def clean_build():
     """Bersihkan folder build sebelumnya"""
@@ -13,6 +17,9 @@ def clean_build():
 
 def build_app():
     """Build aplikasi menjadi executable"""
+    if reportlab.Version != REPORTLAB_VERSI:
+        raise SystemExit(f"reportlab {reportlab.Version} terpasang, build memakai {REPORTLAB_VERSI}: "
+                         f"pip install reportlab=={REPORTLAB_VERSI}")
     
     # Data files yang diperlukan
     data_files = [
@@ -0,0 +1,413 @@
+# cetak.py
+import csv
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import zlib
+from contextlib import suppress
+from datetime import datetime
+from itertools import accumulate
+
+from PyQt5.QtWidgets import QTableWidgetItem
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFDictionary, PDFName, PDFStream
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+import database
+import laporan
+from pekerja import cek_batal
+
+# Renderer untuk laporan.Dataset. Nilai diformat di sini saja, tidak pernah dibaca balik dari teks.
+
+HALAMAN = letter
+MARGIN = 40
+PADDING = 3
+TINGGI_BARIS = 14
+FONT, FONT_TEBAL, UKURAN = "Helvetica", "Helvetica-Bold", 9
+
+
+def teks(nilai):
+    """Teks tampilan satu nilai (Rupiah -> "Rp 12,500", 3.0 -> "3")"""
+    if nilai is None:
+        return ""
+    if isinstance(nilai, float):
+        return f"{nilai:.2f}".rstrip("0").rstrip(".")
+    return str(nilai)
+
+
+def isi_tabel(tabel, ds):
+    """Tampilkan dataset di QTableWidget"""
+    tabel.setColumnCount(len(ds.kolom))
+    tabel.setHorizontalHeaderLabels([k.judul for k in ds.kolom])
+    tabel.setRowCount(len(ds.baris))
+    for row, baris in enumerate(ds.baris):
+        for col, nilai in enumerate(baris):
+            tabel.setItem(row, col, QTableWidgetItem(teks(nilai)))
+
+
+def tulis_csv(path, ds):
+    """Tulis dataset ke CSV dan kembalikan jumlah barisnya.
+
+    Angka dan uang ditulis sebagai bilangan, bukan teks "Rp ...". Baris diiterasi
+    sekali, jadi laporan.Aliran ditulis langsung dari cursor dengan memori tetap.
+    """
+    uang = [i for i, k in enumerate(ds.kolom) if issubclass(k.tipe, int) and k.tipe is not int]
+    jumlah = 0
+    with open(path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow([k.judul for k in ds.kolom])
+        for baris in ds.baris:
+            if uang:
+                baris = list(baris)
+                for i in uang:
+                    baris[i] = int(baris[i])
+            writer.writerow(baris)
+            jumlah += 1
+    return jumlah
+
+
+def _potong(s, lebar, font=FONT, ukuran=UKURAN):
+    """Potong teks dengan "..." agar muat di lebar (point)"""
+    if stringWidth(s, font, ukuran) <= lebar:
+        return s
+    while s and stringWidth(s + "...", font, ukuran) > lebar:
+        s = s[:-1]
+    return s + "..."
+
+
+class _Pdf:
+    """Tabel PDF dengan header kolom di setiap halaman, footer, dan pindah halaman otomatis"""
+
+    def __init__(self, path, ds, kolom):
+        self.c = canvas.Canvas(path, pagesize=HALAMAN)
+        self.width, self.height = HALAMAN
+        self.ds = ds
+        self.kolom = kolom  # indeks kolom dataset yang dicetak, urut kiri ke kanan
+        # Lebar kolom sebanding Kolom.lebar, memenuhi lebar halaman di antara margin
+        bobot = [ds.kolom[i].lebar for i in kolom]
+        lebar_total = self.width - 2 * MARGIN
+        self.lebar = [lebar_total * b / sum(bobot) for b in bobot]
+        self.x = [MARGIN + x for x in accumulate([0] + self.lebar[:-1])]
+        self.kanan = [issubclass(ds.kolom[i].tipe, (int, float)) for i in kolom]
+        self.dicetak = datetime.now().strftime("%d-%m-%Y %H:%M")
+        self.halaman = 0
+        self._halaman_baru()
+
+    def _halaman_baru(self):
+        c = self.c
+        if self.halaman:
+            self._footer()
+            cek_batal()
+            self._tutup_halaman()
+        self.halaman += 1
+        y = self.height - MARGIN - 10
+        if self.halaman == 1:
+            c.setFont(FONT_TEBAL, 16)
+            c.drawCentredString(self.width/2, y, self.ds.judul)
+            y -= 20
+            if self.ds.keterangan:
+                c.setFont(FONT, 11)
+                c.drawCentredString(self.width/2, y, self.ds.keterangan)
+                y -= 20
+        else:
+            c.setFont(FONT_TEBAL, 10)
+            c.drawString(MARGIN, y, f"{self.ds.judul} (lanjutan)")
+            y -= 20
+        self.y = y - 10
+        self._sel([self.ds.kolom[i].judul for i in self.kolom], FONT_TEBAL, semua_kiri=True)
+        self.garis()
+
+    def _footer(self):
+        c = self.c
+        c.setFont("Helvetica-Oblique", 8)
+        c.drawString(MARGIN, MARGIN / 2, f"Aplikasi Laundry - dicetak {self.dicetak}")
+        c.drawRightString(self.width - MARGIN, MARGIN / 2, f"Halaman {self.halaman}")
+
+    def _sel(self, nilai, font=FONT, semua_kiri=False):
+        self.c.setFont(font, UKURAN)
+        for x, lebar, kanan, v in zip(self.x, self.lebar, self.kanan, nilai):
+            if kanan and not semua_kiri:
+                # Angka tidak pernah dipotong; jika terlalu panjang melebar ke kiri
+                self.c.drawRightString(x + lebar - PADDING, self.y, teks(v))
+            else:
+                self.c.drawString(x + PADDING, self.y, _potong(teks(v), lebar - 2 * PADDING, font))
+        self.y -= TINGGI_BARIS
+
+    def _cukup(self, baris=1):
+        if self.y - (baris - 1) * TINGGI_BARIS < MARGIN + 10:
+            self._halaman_baru()
+
+    def garis(self):
+        self.c.line(MARGIN, self.y + TINGGI_BARIS - 3, self.width - MARGIN, self.y + TINGGI_BARIS - 3)
+
+    def baris(self, baris):
+        self._cukup()
+        self._sel([baris[i] for i in self.kolom])
+
+    def judul_grup(self, s):
+        self._cukup(2)  # judul grup tidak dibiarkan sendirian di bawah halaman
+        self.c.setFont(FONT_TEBAL, UKURAN + 1)
+        self.c.drawString(MARGIN + PADDING, self.y, s)
+        self.y -= TINGGI_BARIS
+
+    def baris_total(self, label, total):
+        """Baris total: label di kiri sampai kolom pertama yang punya jumlah"""
+        self._cukup()
+        self.y -= 2
+        self.garis()
+        nilai = [total[i] for i in self.kolom]
+        sampai = next((n for n, v in enumerate(nilai) if v is not None), len(nilai))
+        lebar_label = sum(self.lebar[:sampai]) or self.lebar[0]
+        self.c.setFont(FONT_TEBAL, UKURAN)
+        self.c.drawString(MARGIN + PADDING, self.y, _potong(label, lebar_label - 2 * PADDING, FONT_TEBAL))
+        self._sel([v if n >= sampai else None for n, v in enumerate(nilai)], FONT_TEBAL)
+        self.y -= 4
+
+    def _tutup_halaman(self):
+        """showPage, lalu kompres isi halaman itu sekarang juga.
+
+        reportlab menyimpan isi setiap halaman sebagai teks dan baru mengompresnya
+        saat save(), sehingga memori tumbuh per halaman. Stream yang sudah punya
+        Filter tidak dikompres ulang oleh reportlab. Ini memakai bagian internal
+        reportlab (versi dipatok di build.py); jika bentuknya berubah, halaman
+        dibiarkan dan dikompres saat save() seperti biasa.
+        """
+        self.c.showPage()
+        try:
+            halaman = self.c._doc.Pages.pages[-1]
+            isi = halaman.stream
+        except (AttributeError, IndexError):
+            return
+        if isinstance(isi, str) and isi:
+            filter_ = PDFDictionary({'Filter': PDFArray([PDFName('FlateDecode')])})
+            halaman.Contents = PDFStream(filter_, zlib.compress(isi.encode('utf8')))
+            halaman.stream = None
+
+    def simpan(self):
+        self._footer()
+        self._tutup_halaman()
+        self.c.save()
+
+
+def tulis_pdf(path, ds):
+    """Cetak dataset ke PDF sesuai definisi laporannya (kolom, grup, total).
+
+    Baris hanya diiterasi sekali dan total dihitung sambil jalan, sehingga
+    ds.baris boleh berupa laporan.Aliran yang dibaca langsung dari cursor.
+    """
+    satuan = ds.laporan.satuan
+    grup = ds.laporan.grup
+    pdf = _Pdf(path, ds, [i for i in range(len(ds.kolom)) if i != grup])
+    kolom_total = [i for i, k in enumerate(ds.kolom) if k.total]
+    nol = lambda: [k.tipe() if k.total else None for k in ds.kolom]
+    total, jumlah = nol(), 0
+    subtotal, jumlah_grup, nilai_grup = None, 0, None
+    for baris in ds.baris:
+        if grup is not None and (subtotal is None or baris[grup] != nilai_grup):
+            if subtotal is not None:
+                pdf.baris_total(f"Subtotal ({jumlah_grup} {satuan})", subtotal)
+            subtotal, jumlah_grup, nilai_grup = nol(), 0, baris[grup]
+            pdf.judul_grup(f"{ds.kolom[grup].judul}: {teks(nilai_grup)}")
+        pdf.baris(baris)
+        jumlah += 1
+        for i in kolom_total:
+            total[i] += baris[i]
+        if subtotal is not None:
+            jumlah_grup += 1
+            for i in kolom_total:
+                subtotal[i] += baris[i]
+    if subtotal is not None:
+        pdf.baris_total(f"Subtotal ({jumlah_grup} {satuan})", subtotal)
+    pdf.baris_total(f"TOTAL ({jumlah} {satuan})", total)
+    pdf.simpan()
+
+
+def siapkan_proses(db_path):
+    """Initializer proses cetak (pekerja.PelaksanaProses): pakai database yang sama dengan aplikasi"""
+    database.DB_PATH = db_path
+
+
+def cetak_ke_folder(folder, nama, *parameter):
+    """Cetak laporan `nama` ke folder dengan nama file bawaannya; None jika laporannya kosong.
+
+    Dijalankan di proses cetak oleh "Cetak Semua Laporan".
+    """
+    if not laporan.ada_data(nama, *parameter):
+        return None
+    ds = laporan.buka(nama, *parameter)
+    path = os.path.join(folder, ds.laporan.nama_file)
+    tulis_pdf(path, ds)
+    return path
+
+
+# Bagian invoice yang sama untuk semua order (kop, judul bagian, label, garis, footer)
+# digambar sekali per PDF sebagai form XObject; tiap halaman hanya memanggilnya lalu
+# menulis isian order itu di sebelah labelnya.
+TEMPLATE_INVOICE = "TemplateInvoice"
+_Y_INFO = HALAMAN[1] - 150
+_Y_TABEL = _Y_INFO - 165
+_LABEL_INVOICE = {          # isian -> (label, y); nilai ditulis tepat setelah label
+    'id': ("No. Invoice    : ", _Y_INFO - 20),
+    'tanggal': ("Tanggal        : ", _Y_INFO - 35),
+    'status': ("Status         : ", _Y_INFO - 50),
+    'nama': ("Nama           : ", _Y_INFO - 100),
+    'telepon': ("Telepon        : ", _Y_INFO - 115),
+}
+
+
+def _gambar_template_invoice(c):
+    """Definisikan form TEMPLATE_INVOICE di canvas c; cukup sekali per dokumen"""
+    width, height = HALAMAN
+    c.beginForm(TEMPLATE_INVOICE)
+
+    # Header Invoice
+    c.setFont("Helvetica-Bold", 18)
+    c.drawCentredString(width/2, height - 50, "LAUNDRY EXPRESS")
+    c.setFont("Helvetica", 10)
+    c.drawCentredString(width/2, height - 70, "Jl. Contoh No. 123, Kota Anda")
+    c.drawCentredString(width/2, height - 85, "Telp: (021) 1234567")
+
+    c.setFont("Helvetica-Bold", 14)
+    c.drawCentredString(width/2, height - 110, "INVOICE / STRUK PEMBAYARAN")
+    c.line(50, height - 120, width - 50, height - 120)
+
+    # Judul bagian dan label
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(70, _Y_INFO, "INFORMASI ORDER")
+    c.drawString(70, _Y_INFO - 80, "INFORMASI PELANGGAN")
+    c.drawString(70, _Y_INFO - 145, "DETAIL ORDER")
+    c.setFont("Helvetica", 10)
+    for label, y in _LABEL_INVOICE.values():
+        c.drawString(70, y, label)
+
+    # Tabel detail
+    c.setFont("Helvetica-Bold", 10)
+    c.drawString(70, _Y_TABEL, "Layanan")
+    c.drawString(200, _Y_TABEL, "Berat")
+    c.drawString(300, _Y_TABEL, "Biaya")
+    c.line(70, _Y_TABEL - 5, 400, _Y_TABEL - 5)
+
+    # Total
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(250, _Y_TABEL - 50, "TOTAL BAYAR:")
+    c.line(250, _Y_TABEL - 55, 450, _Y_TABEL - 55)
+
+    # Footer
+    c.setFont("Helvetica-Oblique", 9)
+    c.drawCentredString(width/2, _Y_TABEL - 80, "Terima kasih atas kepercayaan Anda!")
+    c.drawCentredString(width/2, _Y_TABEL - 95, "Struk ini sebagai bukti pembayaran yang sah")
+
+    c.endForm()
+
+
+def _gambar_invoice(c, inv):
+    """Gambar satu invoice (laporan.Invoice) di halaman aktif: template lalu isian order"""
+    c.doForm(TEMPLATE_INVOICE)
+
+    c.setFont("Helvetica", 10)
+    # Kolom order/pelanggan boleh NULL: teks() menjadikannya kosong, bukan error
+    isian = {'id': f"LAUNDRY-{inv.id}", 'tanggal': teks(inv.tanggal), 'status': teks(inv.status),
+             'nama': teks(inv.nama), 'telepon': teks(inv.telepon)}
+    for kunci, (label, y) in _LABEL_INVOICE.items():
+        c.drawString(70 + stringWidth(label, "Helvetica", 10), y, isian[kunci])
+    # Est. Selesai hanya ada untuk layanan yang dikenal katalog, jadi tidak masuk template
+    if inv.selesai:
+        c.drawString(70, _Y_INFO - 65, f"Est. Selesai   : {inv.selesai:%Y-%m-%d}")
+
+    c.drawString(70, _Y_TABEL - 20, teks(inv.layanan))
+    if inv.berat is not None:
+        c.drawString(200, _Y_TABEL - 20, f"{teks(inv.berat)} kg")
+    c.drawString(300, _Y_TABEL - 20, str(inv.biaya))
+
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(350, _Y_TABEL - 50, str(inv.biaya))
+
+
+def tulis_invoice_pdf(path, daftar_invoice):
+    """Tulis satu atau banyak invoice ke satu PDF, satu halaman per order"""
+    c = canvas.Canvas(path, pagesize=HALAMAN, pageCompression=1)
+    _gambar_template_invoice(c)
+    for inv in daftar_invoice:
+        cek_batal()
+        _gambar_invoice(c, inv)
+        c.showPage()
+    c.save()
+
+
+# --- CACHE INVOICE ---
+# PDF invoice disimpan di folder cache dengan nama "<id order>-<hash isi>.pdf". Hash dihitung
+# dari semua yang tercetak, jadi perubahan order atau pembayaran (status, biaya, pelanggan)
+# otomatis menghasilkan kunci baru; file versi lama order itu dihapus saat versi baru dibuat.
+VERSI_INVOICE = 3                      # naikkan jika tata letak invoice berubah
+MAKS_CACHE_INVOICE = 50 * 1024 * 1024  # byte; file yang paling lama tidak dipakai dihapus dulu
+
+
+def folder_cache_invoice():
+    return os.path.join(os.path.dirname(os.path.abspath(database.DB_PATH)), "cache_invoice")
+
+
+def _kunci_invoice(inv):
+    isi = repr((VERSI_INVOICE, tuple(inv), inv.selesai))  # Est. Selesai ikut tercetak
+    return f"{inv.id}-{hashlib.sha1(isi.encode()).hexdigest()[:16]}"
+
+
+def _pangkas_cache(folder):
+    """Hapus file terlama (mtime = terakhir dipakai) sampai total ukuran folder <= MAKS_CACHE_INVOICE.
+
+    Folder ini dipakai bersama kasir lain (di samping laundry.db), jadi file bisa hilang kapan
+    saja; file .tmp milik penulis yang sedang berjalan tidak disentuh kecuali sudah basi.
+    """
+    entri = []
+    for e in os.scandir(folder):
+        with suppress(FileNotFoundError):
+            info = e.stat()
+            if not e.name.endswith(".tmp"):
+                entri.append((info.st_mtime, info.st_size, e.path))
+            elif info.st_mtime < time.time() - 3600:
+                os.remove(e.path)  # sisa penulis yang gagal/mati
+    entri.sort(reverse=True)
+    total = 0
+    for _, ukuran, path in entri:
+        total += ukuran
+        if total > MAKS_CACHE_INVOICE:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+
+def invoice_pdf(inv):
+    """Path PDF invoice di cache; dibuat dulu jika belum ada untuk isi order ini"""
+    folder = folder_cache_invoice()
+    os.makedirs(folder, exist_ok=True)
+    kunci = _kunci_invoice(inv)
+    path = os.path.join(folder, f"{kunci}.pdf")
+    with suppress(FileNotFoundError):
+        os.utime(path)  # ada: tandai baru dipakai untuk LRU
+        return path
+
+    for e in os.scandir(folder):
+        if e.name.startswith(f"{inv.id}-") and e.name.endswith(".pdf") and e.path != path:
+            with suppress(FileNotFoundError):
+                os.remove(e.path)
+    fd, sementara = tempfile.mkstemp(prefix=f"{kunci}.", suffix=".tmp", dir=folder)
+    os.close(fd)
+    try:
+        tulis_invoice_pdf(sementara, [inv])
+        os.replace(sementara, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(sementara)
+        raise
+    _pangkas_cache(folder)
+    return path
+
+
+def simpan_invoice(path, inv):
+    """Simpan PDF satu invoice ke path; cetak ulang order yang tidak berubah cukup menyalin cache"""
+    try:
+        shutil.copyfile(invoice_pdf(inv), path)
+    except FileNotFoundError:
+        # Dipangkas kasir lain tepat setelah ditemukan: invoice_pdf membuatnya ulang
+        shutil.copyfile(invoice_pdf(inv), path)
@@ -0,0 +1,466 @@
+# database.py
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DB_PATH = 'laundry.db'
+
+# Lama menunggu kunci database milik kasir lain sebelum SQLITE_BUSY (ms).
+# Bisa diatur per komputer lewat environment variable LAUNDRY_BUSY_TIMEOUT.
+BUSY_TIMEOUT_MS = int(os.environ.get('LAUNDRY_BUSY_TIMEOUT', 5000))
+
+# Retry transaksi tulis jika database masih terkunci setelah busy_timeout
+RETRY_MAKS = 5
+RETRY_JEDA_AWAL = 0.05  # detik, dikali 2 setiap percobaan
+
+# Pragma yang dipasang sekali per koneksi
+PRAGMAS = [
+    # WAL: pembaca tidak memblokir penulis dan sebaliknya (multi kasir)
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",  # ~8 MB page cache
+]
+
+_local = threading.local()
+_semua_koneksi = []
+_lock = threading.Lock()
+_generasi = 0  # naik setiap tutup_semua() agar koneksi lama tidak dipakai lagi
+
+
+def _buka_koneksi():
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    with _lock:
+        _semua_koneksi.append(conn)
+    return conn
+
+
+def get_connection():
+    """Koneksi milik thread ini, dibuka sekali lalu dipakai ulang"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None or getattr(_local, 'generasi', None) != _generasi:
+        conn = _buka_koneksi()
+        _local.conn = conn
+        _local.generasi = _generasi
+    return conn
+
+
+@contextmanager
+def cursor():
+    """Cursor untuk query baca, selalu ditutup setelah dipakai"""
+    c = get_connection().cursor()
+    try:
+        yield c
+    finally:
+        c.close()
+
+
+def _terkunci(e):
+    pesan = str(e).lower()
+    return 'locked' in pesan or 'busy' in pesan
+
+
+def _begin_immediate(c):
+    """Ambil kunci tulis di awal transaksi, ulangi dengan backoff jika terkunci"""
+    jeda = RETRY_JEDA_AWAL
+    for percobaan in range(RETRY_MAKS):
+        try:
+            c.execute("BEGIN IMMEDIATE")
+            return
+        except sqlite3.OperationalError as e:
+            if not _terkunci(e) or percobaan == RETRY_MAKS - 1:
+                raise
+            time.sleep(jeda + random.uniform(0, jeda))
+            jeda *= 2
+
+
+@contextmanager
+def transaksi():
+    """Cursor untuk query tulis: commit jika sukses, rollback jika gagal.
+
+    Kunci tulis diambil di awal (BEGIN IMMEDIATE) sehingga bentrok dengan kasir
+    lain terjadi sebelum ada perubahan, dan bisa diulang dengan aman.
+    """
+    conn = get_connection()
+    c = conn.cursor()
+    try:
+        _begin_immediate(c)
+        yield c
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        c.close()
+
+
+def tutup_semua():
+    """Tutup semua koneksi (dipanggil saat aplikasi keluar)"""
+    global _generasi
+    with _lock:
+        while _semua_koneksi:
+            _semua_koneksi.pop().close()
+        _generasi += 1
+
+
+# --- MIGRASI SKEMA ---
+# Setiap migrasi dijalankan sekali, urut, dan nomornya disimpan di PRAGMA user_version.
+# Jangan ubah migrasi yang sudah ada; tambahkan fungsi baru di akhir daftar MIGRASI.
+
+def _migrasi_skema_awal(c):
+    """Tabel dasar aplikasi (sama dengan skema laundry.db lama)"""
+    # Tabel Users
+    c.execute('''CREATE TABLE IF NOT EXISTS users
+                 (id INTEGER PRIMARY KEY, username TEXT UNIQUE, password TEXT, role TEXT)''')
+    c.execute("INSERT OR IGNORE INTO users (username, password, role) VALUES ('admin', 'admin123', 'admin')")
+    # Tabel Pelanggan
+    c.execute('''CREATE TABLE IF NOT EXISTS pelanggan
+                 (id INTEGER PRIMARY KEY, nama TEXT, alamat TEXT, telepon TEXT, email TEXT)''')
+    # Tabel Orders
+    c.execute('''CREATE TABLE IF NOT EXISTS orders
+                 (id INTEGER PRIMARY KEY, pelanggan_id INTEGER, tanggal TEXT, layanan TEXT, berat REAL, biaya REAL, status TEXT, FOREIGN KEY(pelanggan_id) REFERENCES pelanggan(id))''')
+    # Tabel Inventory
+    c.execute('''CREATE TABLE IF NOT EXISTS inventory
+                 (id INTEGER PRIMARY KEY, nama TEXT, stok INTEGER, harga_beli REAL)''')
+    # Tabel Pembayaran
+    c.execute('''CREATE TABLE IF NOT EXISTS pembayaran
+                 (id INTEGER PRIMARY KEY, order_id INTEGER, tanggal TEXT, jumlah_bayar REAL, kembalian REAL, FOREIGN KEY(order_id) REFERENCES orders(id))''')
+
+
+def _migrasi_index(c):
+    """Index untuk filter tanggal, GROUP BY status dan JOIN"""
+    # Covering index: dashboard & laporan cukup membaca index tanpa menyentuh tabel
+    c.execute("CREATE INDEX IF NOT EXISTS idx_orders_tanggal_status_biaya ON orders(tanggal, status, biaya)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_orders_pelanggan ON orders(pelanggan_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_pembayaran_order ON pembayaran(order_id)")
+
+
+def _migrasi_ringkasan_harian(c):
+    """Tabel ringkasan per (tanggal, status) yang dijaga trigger pada orders"""
+    c.execute('''CREATE TABLE IF NOT EXISTS ringkasan_harian
+                 (tanggal TEXT NOT NULL, status TEXT NOT NULL,
+                  jumlah_order INTEGER NOT NULL DEFAULT 0, pendapatan REAL NOT NULL DEFAULT 0,
+                  PRIMARY KEY (tanggal, status)) WITHOUT ROWID''')
+    # Order dengan tanggal/status NULL dicatat sebagai '' agar tetap terhitung
+    tambah = '''INSERT INTO ringkasan_harian (tanggal, status, jumlah_order, pendapatan)
+                VALUES (COALESCE(NEW.tanggal, ''), COALESCE(NEW.status, ''), 1, COALESCE(NEW.biaya, 0))
+                ON CONFLICT (tanggal, status) DO UPDATE SET
+                    jumlah_order = jumlah_order + 1,
+                    pendapatan = pendapatan + excluded.pendapatan;'''
+    kurang = '''UPDATE ringkasan_harian
+                SET jumlah_order = jumlah_order - 1, pendapatan = pendapatan - COALESCE(OLD.biaya, 0)
+                WHERE tanggal = COALESCE(OLD.tanggal, '') AND status = COALESCE(OLD.status, '');
+                DELETE FROM ringkasan_harian
+                WHERE tanggal = COALESCE(OLD.tanggal, '') AND status = COALESCE(OLD.status, '')
+                  AND jumlah_order <= 0;'''
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_orders_ringkasan_insert AFTER INSERT ON orders BEGIN {tambah} END")
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_orders_ringkasan_delete AFTER DELETE ON orders BEGIN {kurang} END")
+    c.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_orders_ringkasan_update
+                 AFTER UPDATE OF tanggal, status, biaya ON orders BEGIN {kurang} {tambah} END""")
+    _isi_ringkasan_harian(c)
+
+
+def _isi_ringkasan_harian(c):
+    c.execute("DELETE FROM ringkasan_harian")
+    c.execute('''INSERT INTO ringkasan_harian (tanggal, status, jumlah_order, pendapatan)
+                 SELECT COALESCE(tanggal, ''), COALESCE(status, ''), COUNT(id), COALESCE(SUM(biaya), 0)
+                 FROM orders GROUP BY 1, 2''')
+
+
+# Rollup di atas ringkasan_harian: (tabel, kolom kunci, panjang prefix tanggal)
+ROLLUP = [
+    ('ringkasan_bulanan', 'bulan', 7),   # 'YYYY-MM'
+    ('ringkasan_tahunan', 'tahun', 4),   # 'YYYY'
+]
+
+
+def _migrasi_ringkasan_bulanan_tahunan(c):
+    """Rollup bulan dan tahun, diperbarui trigger pada ringkasan_harian"""
+    tambah, kurang = [], []
+    for tabel, kolom, panjang in ROLLUP:
+        c.execute(f'''CREATE TABLE IF NOT EXISTS {tabel}
+                      ({kolom} TEXT NOT NULL, status TEXT NOT NULL,
+                       jumlah_order INTEGER NOT NULL DEFAULT 0, pendapatan REAL NOT NULL DEFAULT 0,
+                       PRIMARY KEY ({kolom}, status)) WITHOUT ROWID''')
+        tambah.append(f'''INSERT INTO {tabel} ({kolom}, status, jumlah_order, pendapatan)
+                          VALUES (substr(NEW.tanggal, 1, {panjang}), NEW.status, NEW.jumlah_order, NEW.pendapatan)
+                          ON CONFLICT ({kolom}, status) DO UPDATE SET
+                              jumlah_order = jumlah_order + excluded.jumlah_order,
+                              pendapatan = pendapatan + excluded.pendapatan;''')
+        kurang.append(f'''UPDATE {tabel}
+                          SET jumlah_order = jumlah_order - OLD.jumlah_order, pendapatan = pendapatan - OLD.pendapatan
+                          WHERE {kolom} = substr(OLD.tanggal, 1, {panjang}) AND status = OLD.status;
+                          DELETE FROM {tabel}
+                          WHERE {kolom} = substr(OLD.tanggal, 1, {panjang}) AND status = OLD.status
+                            AND jumlah_order <= 0;''')
+        c.execute(f'''INSERT INTO {tabel} ({kolom}, status, jumlah_order, pendapatan)
+                      SELECT substr(tanggal, 1, {panjang}), status, SUM(jumlah_order), SUM(pendapatan)
+                      FROM ringkasan_harian GROUP BY 1, 2''')
+    tambah, kurang = ' '.join(tambah), ' '.join(kurang)
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_ringkasan_rollup_insert AFTER INSERT ON ringkasan_harian BEGIN {tambah} END")
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_ringkasan_rollup_delete AFTER DELETE ON ringkasan_harian BEGIN {kurang} END")
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_ringkasan_rollup_update AFTER UPDATE ON ringkasan_harian BEGIN {kurang} {tambah} END")
+
+
+def _migrasi_index_daftar_order(c):
+    """Index (tanggal, rowid) untuk paging daftar order terbaru dulu"""
+    c.execute("CREATE INDEX IF NOT EXISTS idx_orders_tanggal ON orders(tanggal)")
+
+
+def _migrasi_index_urut(c):
+    """Index untuk kolom yang sering dipakai mengurutkan/mencari di tab Pelanggan, Order, Inventory"""
+    c.execute("CREATE INDEX IF NOT EXISTS idx_pelanggan_nama ON pelanggan(nama)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_pelanggan_telepon ON pelanggan(telepon)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_inventory_nama ON inventory(nama)")
+
+
+def _migrasi_fts_pelanggan(c):
+    """Index full-text (trigram) untuk pencarian pelanggan, dijaga trigger"""
+    try:
+        c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS pelanggan_fts
+                     USING fts5(nama, alamat, telepon, email,
+                                content='pelanggan', content_rowid='id', tokenize='trigram')''')
+    except sqlite3.OperationalError as e:
+        # SQLite tanpa FTS5/trigram (< 3.34): pencarian tetap jalan dengan LIKE
+        print(f"FTS pelanggan tidak tersedia: {e}")
+        return
+    kolom = "nama, alamat, telepon, email"
+    hapus = f"INSERT INTO pelanggan_fts (pelanggan_fts, rowid, {kolom}) VALUES ('delete', OLD.id, OLD.nama, OLD.alamat, OLD.telepon, OLD.email);"
+    tambah = f"INSERT INTO pelanggan_fts (rowid, {kolom}) VALUES (NEW.id, NEW.nama, NEW.alamat, NEW.telepon, NEW.email);"
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_pelanggan_fts_insert AFTER INSERT ON pelanggan BEGIN {tambah} END")
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_pelanggan_fts_delete AFTER DELETE ON pelanggan BEGIN {hapus} END")
+    c.execute(f"CREATE TRIGGER IF NOT EXISTS trg_pelanggan_fts_update AFTER UPDATE ON pelanggan BEGIN {hapus} {tambah} END")
+    c.execute("INSERT INTO pelanggan_fts (pelanggan_fts) VALUES ('rebuild')")
+
+
+def _migrasi_layanan(c):
+    """Katalog layanan (sebelumnya tertulis di kode OrderDialog)"""
+    c.execute('''CREATE TABLE IF NOT EXISTS layanan
+                 (id INTEGER PRIMARY KEY, nama TEXT UNIQUE NOT NULL, harga_per_kg REAL NOT NULL,
+                  biaya_minimum REAL NOT NULL DEFAULT 0, lama_hari INTEGER NOT NULL DEFAULT 1,
+                  aktif INTEGER NOT NULL DEFAULT 1)''')
+    c.executemany("INSERT OR IGNORE INTO layanan (nama, harga_per_kg, lama_hari) VALUES (?, ?, ?)",
+                  [('Cuci Kering', 5000, 2), ('Setrika', 3000, 1), ('Cuci Basah', 4000, 2)])
+
+
+def _migrasi_aturan_harga(c):
+    """Aturan harga (tier per kg, diskon member, tambahan express) serta flag member/express"""
+    c.execute('''CREATE TABLE IF NOT EXISTS aturan_harga
+                 (id INTEGER PRIMARY KEY, jenis TEXT NOT NULL CHECK (jenis IN ('tier', 'member', 'express')),
+                  layanan TEXT, berat_min REAL NOT NULL DEFAULT 0, nilai REAL NOT NULL,
+                  aktif INTEGER NOT NULL DEFAULT 1)''')
+    c.execute("ALTER TABLE pelanggan ADD COLUMN member INTEGER NOT NULL DEFAULT 0")
+    c.execute("ALTER TABLE orders ADD COLUMN express INTEGER NOT NULL DEFAULT 0")
+
+
+def _ubah_kolom_integer(c, tabel, kolom):
+    """Ubah kolom REAL menjadi INTEGER (dibulatkan) dengan membangun ulang tabel.
+
+    SQLite tidak punya ALTER COLUMN: tabel baru dibuat dari SQL lama dengan tipe
+    diganti, isi disalin, tabel lama dihapus, lalu index dan trigger dibuat ulang.
+    """
+    c.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (tabel,))
+    sql_tabel = c.fetchone()[0]
+    c.execute("SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name=? AND sql IS NOT NULL",
+              (tabel,))
+    sql_lain = [row[0] for row in c.fetchall()]
+    semua_kolom = [row[1] for row in c.execute(f"PRAGMA table_info({tabel})").fetchall()]
+
+    baru = f"{tabel}_baru"
+    sql_baru = re.sub(rf"^CREATE TABLE\s+(IF NOT EXISTS\s+)?{tabel}\b", f"CREATE TABLE {baru}", sql_tabel)
+    for k in kolom:
+        sql_baru = re.sub(rf"\b{k}\s+REAL\b", f"{k} INTEGER", sql_baru)
+    c.execute(sql_baru)
+    pilih = ", ".join(f"CAST(round({k}) AS INTEGER)" if k in kolom else k for k in semua_kolom)
+    c.execute(f"INSERT INTO {baru} ({', '.join(semua_kolom)}) SELECT {pilih} FROM {tabel}")
+    c.execute(f"DROP TABLE {tabel}")
+    # Trigger tabel lain yang menyebut tabel ini (misalnya rollup ringkasan) sempat tidak valid;
+    # mode legacy tidak memeriksa/mengubah trigger tersebut saat rename
+    c.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        c.execute(f"ALTER TABLE {baru} RENAME TO {tabel}")
+    finally:
+        c.execute("PRAGMA legacy_alter_table = OFF")
+    for sql in sql_lain:
+        c.execute(sql)
+
+
+# Kolom uang yang disimpan sebagai rupiah bulat
+KOLOM_UANG = [
+    ('orders', ['biaya']),
+    ('inventory', ['harga_beli']),
+    ('pembayaran', ['jumlah_bayar', 'kembalian']),
+    ('layanan', ['harga_per_kg', 'biaya_minimum']),
+    ('ringkasan_harian', ['pendapatan']),
+    ('ringkasan_bulanan', ['pendapatan']),
+    ('ringkasan_tahunan', ['pendapatan']),
+]
+
+
+def _migrasi_uang_integer(c):
+    """Kolom uang REAL -> INTEGER rupiah: SUM jadi eksak dan tidak ada selisih pembulatan"""
+    for tabel, kolom in KOLOM_UANG:
+        _ubah_kolom_integer(c, tabel, kolom)
+    # Ringkasan dihitung ulang dari biaya yang sudah dibulatkan
+    c.execute("DELETE FROM ringkasan_harian")
+    for tabel, _, _ in ROLLUP:
+        c.execute(f"DELETE FROM {tabel}")
+    _isi_ringkasan_harian(c)
+
+
+def _migrasi_index_nama_nocase(c):
+    """Index nama tanpa beda huruf besar/kecil untuk pencarian awalan nama di cari_pelanggan"""
+    c.execute("CREATE INDEX IF NOT EXISTS idx_pelanggan_nama_nocase ON pelanggan(nama COLLATE NOCASE)")
+
+
+MIGRASI = [
+    _migrasi_skema_awal,
+    _migrasi_index,
+    _migrasi_ringkasan_harian,
+    _migrasi_ringkasan_bulanan_tahunan,
+    _migrasi_index_daftar_order,
+    _migrasi_index_urut,
+    _migrasi_fts_pelanggan,
+    _migrasi_layanan,
+    _migrasi_aturan_harga,
+    _migrasi_uang_integer,
+    _migrasi_index_nama_nocase,
+]
+
+
+def versi_skema():
+    with cursor() as c:
+        c.execute("PRAGMA user_version")
+        return c.fetchone()[0]
+
+
+def data_version():
+    """PRAGMA data_version koneksi thread ini: berubah jika koneksi/proses lain commit"""
+    with cursor() as c:
+        c.execute("PRAGMA data_version")
+        return c.fetchone()[0]
+
+
+def init_db():
+    """Buat/upgrade skema database ke versi terbaru"""
+    try:
+        versi = versi_skema()
+        for nomor in range(versi + 1, len(MIGRASI) + 1):
+            # transaksi() memakai BEGIN eksplisit, jadi DDL ikut di-rollback jika gagal
+            with transaksi() as c:
+                # Kasir lain yang start bersamaan bisa sudah menjalankannya sejak versi dibaca;
+                # di dalam kunci tulis user_version pasti terbaru
+                c.execute("PRAGMA user_version")
+                if c.fetchone()[0] >= nomor:
+                    continue
+                MIGRASI[nomor - 1](c)
+                c.execute(f"PRAGMA user_version = {nomor}")
+        if versi < len(MIGRASI):
+            with cursor() as c:
+                c.execute("ANALYZE")
+    except sqlite3.Error as e:
+        print(f"Database Error: {e}")
+
+
+# --- PENCARIAN PELANGGAN ---
+# Trigram butuh minimal 3 karakter; di bawah itu pencarian memakai LIKE biasa.
+FTS_MIN_KARAKTER = 3
+
+
+def fts_tersedia():
+    with cursor() as c:
+        c.execute("SELECT 1 FROM sqlite_master WHERE name = 'pelanggan_fts'")
+        return c.fetchone() is not None
+
+
+def _query_fts(teks):
+    # Frasa dalam tanda kutip: karakter khusus FTS5 (-, *, :, ...) dianggap teks biasa
+    return '"' + teks.replace('"', '""') + '"'
+
+
+def kondisi_cari_pelanggan(teks, kolom_id='id'):
+    """(WHERE, params) pencarian pelanggan lewat FTS, atau (None, []) jika tidak bisa dipakai"""
+    teks = teks.strip()
+    if len(teks) < FTS_MIN_KARAKTER or not fts_tersedia():
+        return None, []
+    kondisi = f"{kolom_id} IN (SELECT rowid FROM pelanggan_fts WHERE pelanggan_fts MATCH ?)"
+    params = [_query_fts(teks)]
+    if teks.isdigit():
+        kondisi = f"({kondisi} OR {kolom_id} = ?)"
+        params.append(int(teks))
+    return kondisi, params
+
+
+def _rentang_awalan(teks, nocase=False):
+    """(bawah, atas) sehingga bawah <= kolom < atas sama dengan "kolom diawali teks".
+
+    NOCASE SQLite hanya menyamakan huruf ASCII (ke huruf kecil), jadi batas atas
+    dihitung dari teks dengan huruf ASCII kecil.
+    """
+    if nocase:
+        teks = ''.join(ch.lower() if ch.isascii() else ch for ch in teks)
+    return teks, teks[:-1] + chr(ord(teks[-1]) + 1)
+
+
+def cari_pelanggan(teks, limit=20):
+    """Pelanggan yang cocok dengan teks, paling relevan dulu: list (id, nama, telepon)"""
+    teks = teks.strip()
+    if not teks:
+        return []
+    with cursor() as c:
+        if len(teks) >= FTS_MIN_KARAKTER and fts_tersedia():
+            c.execute('''SELECT p.id, p.nama, p.telepon
+                         FROM pelanggan_fts f JOIN pelanggan p ON p.id = f.rowid
+                         WHERE pelanggan_fts MATCH ?
+                         ORDER BY f.rank LIMIT ?''', (_query_fts(teks), limit))
+        else:
+            # Teks pendek: awalan nama atau nomor telepon sebagai rentang, supaya SQLite
+            # bisa seek di idx_pelanggan_nama_nocase dan idx_pelanggan_telepon (LIKE tidak bisa)
+            c.execute('''SELECT id, nama, telepon FROM (
+                             SELECT id, nama, telepon FROM pelanggan
+                             WHERE nama >= ? COLLATE NOCASE AND nama < ? COLLATE NOCASE
+                             ORDER BY nama COLLATE NOCASE LIMIT ?)
+                         UNION
+                         SELECT id, nama, telepon FROM (
+                             SELECT id, nama, telepon FROM pelanggan
+                             WHERE telepon >= ? AND telepon < ? LIMIT ?)
+                         ORDER BY nama COLLATE NOCASE LIMIT ?''',
+                      (*_rentang_awalan(teks, nocase=True), limit, *_rentang_awalan(teks), limit, limit))
+        return c.fetchall()
+
+
+def rebuild_ringkasan():
+    """Hitung ulang semua tabel ringkasan dari tabel orders"""
+    with transaksi() as c:
+        c.execute("DELETE FROM ringkasan_harian")
+        for tabel, _, _ in ROLLUP:
+            c.execute(f"DELETE FROM {tabel}")
+        # Insert ke ringkasan_harian ikut mengisi rollup lewat trigger
+        _isi_ringkasan_harian(c)
+
+
+def backup(tujuan):
+    """Salin database secara konsisten (termasuk isi file -wal)"""
+    dest = sqlite3.connect(tujuan)
+    try:
+        get_connection().backup(dest)
+    finally:
+        dest.close()
+
+
+if __name__ == "__main__":
+    import sys
+    init_db()
+    if sys.argv[1:] == ['rebuild-ringkasan']:
+        rebuild_ringkasan()
+        print("Ringkasan laporan dihitung ulang")
+    else:
+        print("Pemakaian: python database.py rebuild-ringkasan")
@@ -0,0 +1,181 @@
+# harga.py
+from bisect import bisect_right
+from typing import NamedTuple
+
+import database
+import katalog
+from uang import Rupiah
+
+
+class Aturan(NamedTuple):
+    """Satu baris aturan_harga.
+
+    tier    : berat >= berat_min memakai harga per kg = nilai (untuk seluruh berat)
+    member  : diskon nilai persen untuk pelanggan member
+    express : tambahan nilai persen untuk order express
+    layanan None berarti berlaku untuk semua layanan; aturan khusus layanan menang.
+    Layanan yang punya aturan tier sendiri hanya memakai tier itu, tanpa tier umum.
+    """
+    jenis: str
+    layanan: str
+    berat_min: float
+    nilai: float
+
+
+class Tarif(NamedTuple):
+    """Aturan satu layanan yang sudah dikompilasi menjadi tabel lookup"""
+    batas: tuple      # berat_min setiap tier, urut naik, selalu diawali 0
+    harga: tuple      # harga per kg untuk tier yang sama
+    minimum: int
+    diskon_member: float
+    tambahan_express: float
+
+
+class Simulasi(NamedTuple):
+    jumlah_order: int
+    total_lama: int        # total biaya yang tercatat di orders (rupiah)
+    total_baru: int        # total jika dihitung dengan aturan simulasi (rupiah)
+    per_layanan: dict      # layanan -> (jumlah, total_lama, total_baru)
+
+
+_cache = None  # (dict katalog yang dipakai, {layanan: Tarif})
+
+
+def muat_aturan():
+    with database.cursor() as c:
+        # Urut id: jika ada aturan aktif yang sama, yang terakhir disimpan menang
+        c.execute("SELECT jenis, layanan, berat_min, nilai FROM aturan_harga WHERE aktif = 1 ORDER BY id")
+        return [Aturan(*row) for row in c.fetchall()]
+
+
+def _pilih(aturan, jenis, nama):
+    """Nilai persen aturan jenis ini: khusus layanan jika ada (termasuk 0%), jika tidak yang umum"""
+    umum = khusus = None
+    for a in aturan:
+        if a.jenis == jenis:
+            if a.layanan == nama:
+                khusus = a.nilai
+            elif a.layanan is None:
+                umum = a.nilai
+    if khusus is not None:
+        return khusus
+    return umum if umum is not None else 0
+
+
+def kompilasi(daftar_layanan, aturan):
+    """Ubah katalog + aturan menjadi {layanan: Tarif} agar satu perhitungan cukup satu bisect"""
+    hasil = {}
+    for nama, layanan in daftar_layanan.items():
+        tier = {0: layanan.harga_per_kg}
+        # Jadwal tier khusus layanan menggantikan jadwal umum seluruhnya, bukan per berat_min
+        khusus = [a for a in aturan if a.jenis == 'tier' and a.layanan == nama]
+        for a in khusus or [a for a in aturan if a.jenis == 'tier' and a.layanan is None]:
+            tier[a.berat_min] = a.nilai
+        batas = tuple(sorted(tier))
+        hasil[nama] = Tarif(batas, tuple(tier[b] for b in batas), layanan.biaya_minimum,
+                            _pilih(aturan, 'member', nama), _pilih(aturan, 'express', nama))
+    return hasil
+
+
+def tarif():
+    """Tarif semua layanan, dikompilasi ulang hanya jika aturan atau katalog berubah"""
+    global _cache
+    daftar_layanan = katalog.semua()
+    cache = _cache
+    if cache is None or cache[0] is not daftar_layanan:
+        cache = (daftar_layanan, kompilasi(daftar_layanan, muat_aturan()))
+        _cache = cache
+    return cache[1]
+
+
+def invalidasi():
+    """Buang cache aturan dan katalog (tabel aturan_harga/layanan berubah)"""
+    global _cache
+    _cache = None
+    katalog.invalidasi()
+
+
+def _hitung(t, berat, member, express):
+    biaya = berat * t.harga[bisect_right(t.batas, berat) - 1]
+    if express:
+        biaya *= 1 + t.tambahan_express / 100
+    if member:
+        biaya *= 1 - t.diskon_member / 100
+    return Rupiah(max(biaya, t.minimum))
+
+
+def hitung(layanan, berat, member=False, express=False):
+    """Biaya satu order dalam Rupiah; 0 untuk layanan tidak dikenal atau berat 0"""
+    t = tarif().get(layanan)
+    if t is None or berat <= 0:
+        return Rupiah(0)
+    return _hitung(t, berat, member, express)
+
+
+def hitung_banyak(rows, tarif_layanan=None):
+    """Biaya untuk banyak order sekaligus: rows berisi (layanan, berat, member, express)"""
+    tarif_layanan = tarif_layanan or tarif()
+    for layanan, berat, member, express in rows:
+        t = tarif_layanan.get(layanan)
+        yield _hitung(t, berat, member, express) if t is not None and berat and berat > 0 else Rupiah(0)
+
+
+def simulasi(tgl_mulai, tgl_selesai, aturan=None, ukuran=5000):
+    """What-if: hitung ulang order pada rentang tanggal dengan aturan lain (default aturan aktif)"""
+    tarif_layanan = kompilasi(katalog.semua(), muat_aturan() if aturan is None else aturan)
+    jumlah, total_lama, total_baru, per_layanan = 0, 0, 0, {}
+    with database.cursor() as c:
+        c.execute("""SELECT o.layanan, o.berat, COALESCE(p.member, 0), o.express, o.biaya
+                     FROM orders o LEFT JOIN pelanggan p ON o.pelanggan_id = p.id
+                     WHERE o.tanggal BETWEEN ? AND ?""", (tgl_mulai, tgl_selesai))
+        while True:
+            rows = c.fetchmany(ukuran)
+            if not rows:
+                break
+            for row, baru in zip(rows, hitung_banyak((r[:4] for r in rows), tarif_layanan)):
+                lama = row[4] or 0
+                n, l, b = per_layanan.get(row[0], (0, 0, 0))
+                per_layanan[row[0]] = (n + 1, l + lama, b + baru)
+                jumlah, total_lama, total_baru = jumlah + 1, total_lama + lama, total_baru + baru
+    return Simulasi(jumlah, total_lama, total_baru, per_layanan)
+
+
+def simpan_aturan(jenis, nilai, layanan=None, berat_min=0):
+    with database.transaksi() as c:
+        c.execute("INSERT INTO aturan_harga (jenis, layanan, berat_min, nilai) VALUES (?, ?, ?, ?)",
+                  (jenis, layanan, berat_min, nilai))
+    invalidasi()
+
+
+def hapus_aturan(aturan_id):
+    with database.transaksi() as c:
+        c.execute("UPDATE aturan_harga SET aktif = 0 WHERE id = ?", (aturan_id,))
+    invalidasi()
+
+
+if __name__ == "__main__":
+    import sys
+    database.init_db()
+    args = sys.argv[1:]
+    if len(args) == 4 and args[0] == 'tier':
+        simpan_aturan('tier', float(args[3]), args[1] if args[1] != '*' else None, float(args[2]))
+        print("Aturan tier disimpan")
+    elif len(args) in (2, 3) and args[0] in ('member', 'express'):
+        simpan_aturan(args[0], float(args[1]), args[2] if len(args) == 3 else None)
+        print(f"Aturan {args[0]} disimpan")
+    elif len(args) == 2 and args[0] == 'hapus':
+        hapus_aturan(int(args[1]))
+        print("Aturan dinonaktifkan")
+    elif len(args) == 3 and args[0] == 'simulasi':
+        s = simulasi(args[1], args[2])
+        print(f"{s.jumlah_order} order: tercatat {Rupiah(s.total_lama)}, dengan aturan aktif {Rupiah(s.total_baru)}")
+        for layanan, (n, lama, baru) in sorted(s.per_layanan.items(), key=lambda x: str(x[0])):
+            print(f"  {layanan}: {n} order, {Rupiah(lama)} -> {Rupiah(baru)}")
+    elif not args:
+        with database.cursor() as c:
+            c.execute("SELECT id, jenis, COALESCE(layanan, '*'), berat_min, nilai FROM aturan_harga WHERE aktif = 1 ORDER BY jenis, layanan, berat_min")
+            for row in c.fetchall():
+                print(*row)
+    else:
+        print("Pemakaian: python harga.py [tier LAYANAN|* BERAT_MIN HARGA_PER_KG | member PERSEN [LAYANAN] | "
+              "express PERSEN [LAYANAN] | hapus ID | simulasi TGL_MULAI TGL_SELESAI]")
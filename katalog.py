@@ -0,0 +1,88 @@
+# katalog.py
+import threading
+from typing import NamedTuple
+
+import database
+from uang import Rupiah
+
+
+class Layanan(NamedTuple):
+    id: int
+    nama: str
+    harga_per_kg: int      # rupiah
+    biaya_minimum: int
+    lama_hari: int      # estimasi lama pengerjaan
+    aktif: bool
+
+
+_cache = None  # nama -> Layanan, diisi sekali lalu dipakai semua thread
+_lock = threading.Lock()
+
+
+def _muat():
+    with database.cursor() as c:
+        c.execute("SELECT id, nama, harga_per_kg, biaya_minimum, lama_hari, aktif FROM layanan ORDER BY id")
+        return {row[1]: Layanan(*row[:5], bool(row[5])) for row in c.fetchall()}
+
+
+def semua():
+    """Semua layanan (termasuk yang tidak aktif) dari cache, dimuat dari database sekali"""
+    global _cache
+    cache = _cache
+    if cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = _muat()
+            cache = _cache
+    return cache
+
+
+def aktif():
+    """Layanan yang ditawarkan di OrderDialog, urut seperti di database"""
+    return [l for l in semua().values() if l.aktif]
+
+
+def cari(nama):
+    """Layanan berdasarkan nama, None jika tidak ada (misalnya order lama)"""
+    return semua().get(nama)
+
+
+def invalidasi():
+    """Buang cache; dipanggil jika tabel layanan berubah (juga dari kasir lain)"""
+    global _cache
+    _cache = None
+
+
+def simpan(nama, harga_per_kg, biaya_minimum=0, lama_hari=1, aktif=True):
+    """Tambah layanan baru atau ubah layanan dengan nama yang sama"""
+    with database.transaksi() as c:
+        c.execute("""INSERT INTO layanan (nama, harga_per_kg, biaya_minimum, lama_hari, aktif) VALUES (?, ?, ?, ?, ?)
+                     ON CONFLICT(nama) DO UPDATE SET harga_per_kg=excluded.harga_per_kg,
+                         biaya_minimum=excluded.biaya_minimum, lama_hari=excluded.lama_hari, aktif=excluded.aktif""",
+                  (nama, harga_per_kg, biaya_minimum, lama_hari, int(aktif)))
+    invalidasi()
+
+
+if __name__ == "__main__":
+    import sys
+    database.init_db()
+    args = sys.argv[1:]
+    if len(args) >= 3 and args[0] == 'simpan':
+        nama, harga = args[1], Rupiah(args[2])
+        minimum = Rupiah(args[3]) if len(args) > 3 else 0
+        lama = int(args[4]) if len(args) > 4 else 1
+        simpan(nama, harga, minimum, lama)
+        print(f"Layanan {nama} disimpan")
+    elif len(args) == 2 and args[0] == 'nonaktif':
+        layanan = cari(args[1])
+        if layanan is None:
+            print(f"Layanan {args[1]} tidak ada")
+        else:
+            simpan(layanan.nama, layanan.harga_per_kg, layanan.biaya_minimum, layanan.lama_hari, aktif=False)
+            print(f"Layanan {args[1]} tidak ditawarkan lagi")
+    elif not args:
+        for l in semua().values():
+            status = "" if l.aktif else " (nonaktif)"
+            print(f"{l.nama}: {Rupiah(l.harga_per_kg)}/kg, minimum {Rupiah(l.biaya_minimum)}, {l.lama_hari} hari{status}")
+    else:
+        print("Pemakaian: python katalog.py [simpan NAMA HARGA_PER_KG [MINIMUM] [LAMA_HARI] | nonaktif NAMA]")
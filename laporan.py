@@ -0,0 +1,379 @@
+# laporan.py
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Callable, NamedTuple
+
+import database
+import katalog
+from pekerja import cek_batal
+from uang import Rupiah
+
+# Jumlah baris per fetchmany saat laporan dicetak langsung dari cursor
+UKURAN_POTONGAN = 1000
+
+# Level ringkasan dari yang paling halus: (nama, tabel, kolom kunci)
+HARIAN = ('harian', 'ringkasan_harian', 'tanggal')
+BULANAN = ('bulanan', 'ringkasan_bulanan', 'bulan')
+TAHUNAN = ('tahunan', 'ringkasan_tahunan', 'tahun')
+
+# Ekspresi periode untuk setiap tipe laporan di tipeLaporanComboBox
+PERIODE = {
+    'Harian': "tanggal",
+    'Mingguan': "date(tanggal, 'weekday 0', '-6 days')",  # Senin awal minggu
+    'Bulanan': "substr(tanggal, 1, 7)",
+}
+
+
+def _akhir_bulan(d):
+    return date(d.year, d.month, monthrange(d.year, d.month)[1])
+
+
+def pecah_rentang(mulai, selesai, level_maks=TAHUNAN):
+    """Pecah [mulai, selesai] menjadi potongan dengan level ringkasan sekasar mungkin.
+
+    Hasilnya list (level, kunci_awal, kunci_akhir), misalnya 2023-11-15 s/d 2025-02-10:
+    harian 2023-11-15..2023-11-30, bulanan 2023-12..2023-12, tahunan 2024..2024,
+    bulanan 2025-01..2025-01, harian 2025-02-01..2025-02-10.
+    """
+    boleh_tahun = level_maks is TAHUNAN
+    boleh_bulan = level_maks in (BULANAN, TAHUNAN)
+    potongan = []
+    cur = mulai
+    while cur <= selesai:
+        if boleh_tahun and (cur.month, cur.day) == (1, 1) and date(cur.year, 12, 31) <= selesai:
+            tahun = cur.year
+            while date(tahun + 1, 12, 31) <= selesai:
+                tahun += 1
+            potongan.append((TAHUNAN, str(cur.year), str(tahun)))
+            cur = date(tahun + 1, 1, 1)
+        elif boleh_bulan and cur.day == 1 and _akhir_bulan(cur) <= selesai:
+            awal = cur
+            while True:
+                akhir = _akhir_bulan(cur)
+                cur = akhir + timedelta(days=1)
+                # Berhenti jika bulan berikutnya tidak utuh, atau awal tahun yang bisa diambil utuh
+                if _akhir_bulan(cur) > selesai or (boleh_tahun and cur.month == 1 and date(cur.year, 12, 31) <= selesai):
+                    break
+            potongan.append((BULANAN, awal.strftime('%Y-%m'), akhir.strftime('%Y-%m')))
+        else:
+            akhir = min(_akhir_bulan(cur), selesai)
+            potongan.append((HARIAN, cur.isoformat(), akhir.isoformat()))
+            cur = akhir + timedelta(days=1)
+    return potongan
+
+
+def _union_potongan(potongan, kolom_periode):
+    """Gabungkan potongan menjadi satu query UNION ALL (satu kali jalan ke database)"""
+    bagian, params = [], []
+    for (_, tabel, kolom), awal, akhir in potongan:
+        periode = kolom_periode(kolom)
+        bagian.append(f"SELECT {periode} AS periode, status, jumlah_order, pendapatan "
+                      f"FROM {tabel} WHERE {kolom} BETWEEN ? AND ?")
+        params += [awal, akhir]
+    return " UNION ALL ".join(bagian), params
+
+
+def _tanggal(teks):
+    return date.fromisoformat(teks)
+
+
+class Kolom(NamedTuple):
+    judul: str
+    tipe: type = str       # str, int, float atau Rupiah
+    total: bool = False    # dijumlahkan di baris TOTAL
+    lebar: float = 1       # lebar relatif terhadap kolom lain di PDF
+
+
+class Laporan(NamedTuple):
+    """Definisi satu laporan di LAPORAN; dijalankan oleh buat() dan dicetak oleh cetak.tulis_pdf().
+
+    `query(*parameter)` mengembalikan (sql, params), atau None jika pasti kosong.
+    Nama di `parameter` diisi oleh jendela utama (tanggal, tgl_mulai, tgl_selesai, tipe).
+    """
+    nama: str
+    judul: str
+    menu: str              # teks aksi di menu Cetak
+    nama_file: str
+    kolom: tuple           # Kolom, atau fungsi (*parameter) -> Kolom jika judulnya bergantung parameter
+    query: Callable
+    parameter: tuple = ()
+    keterangan: Callable = None  # (*parameter) -> teks di bawah judul
+    grup: int = None       # indeks kolom pengelompokan; query harus urut menurut kolom ini
+    satuan: str = "baris"  # untuk baris TOTAL, misalnya "TOTAL (12 order)"
+    tampil: bool = False   # ditampilkan di laporanTable sebelum dicetak
+
+
+class Dataset(NamedTuple):
+    """Hasil satu laporan: baris berisi nilai asli sesuai tipe kolom, bukan teks tampilan.
+
+    Dibuat sekali oleh buat() (baris berupa list) lalu dipakai oleh semua renderer
+    (tabel Qt, PDF, CSV). `kunci` berisi nama laporan dan parameternya; hasil dengan
+    kunci yang sama boleh dipakai ulang tanpa query lagi. Dari buka(), baris berupa
+    Aliran yang dibaca dari database saat diiterasi.
+    """
+    kunci: tuple
+    laporan: Laporan
+    keterangan: str
+    kolom: tuple
+    baris: list
+
+    @property
+    def judul(self):
+        return self.laporan.judul
+
+    def total(self, baris=None):
+        """Jumlah setiap kolom bertanda total (None untuk kolom lain)"""
+        baris = self.baris if baris is None else baris
+        return [sum((r[i] for r in baris), k.tipe()) if k.total else None
+                for i, k in enumerate(self.kolom)]
+
+
+def _ketik(kolom, rows):
+    """Ubah baris hasil query ke tipe kolomnya; NULL menjadi nilai kosong tipe itu"""
+    tipe = [k.tipe for k in kolom]
+    return [tuple(t(v) if v is not None else t() for t, v in zip(tipe, r)) for r in rows]
+
+
+class Aliran:
+    """Baris laporan yang dibaca dari cursor per potongan (fetchmany) saat diiterasi.
+
+    Hanya satu potongan yang ada di memori, berapa pun jumlah barisnya. Setiap
+    iterasi menjalankan query lagi.
+    """
+
+    def __init__(self, kolom, query, ukuran=UKURAN_POTONGAN):
+        self.kolom = kolom
+        self.query = query
+        self.ukuran = ukuran
+
+    def __iter__(self):
+        if self.query is None:
+            return
+        with database.cursor() as c:
+            c.execute(*self.query)
+            while True:
+                cek_batal()
+                rows = c.fetchmany(self.ukuran)
+                if not rows:
+                    return
+                yield from _ketik(self.kolom, rows)
+
+
+def _periode(tgl_mulai, tgl_selesai, *_):
+    return f"Periode: {_tanggal(tgl_mulai):%d-%m-%Y} sampai {_tanggal(tgl_selesai):%d-%m-%Y}"
+
+
+def _sql_status(tgl_mulai, tgl_selesai):
+    potongan = pecah_rentang(_tanggal(tgl_mulai), _tanggal(tgl_selesai))
+    if not potongan:
+        return None
+    sub, params = _union_potongan(potongan, lambda kolom: "NULL")
+    return f"""
+        SELECT status, SUM(jumlah_order), SUM(pendapatan)
+        FROM ({sub})
+        GROUP BY status
+        ORDER BY status
+    """, params
+
+
+def _sql_pendapatan(tgl_mulai, tgl_selesai, tipe='Harian'):
+    if tipe == 'Bulanan':
+        # Bulan utuh dibaca dari ringkasan_bulanan, sisa di tepi rentang dari ringkasan_harian
+        potongan = pecah_rentang(_tanggal(tgl_mulai), _tanggal(tgl_selesai), BULANAN)
+        kolom_periode = lambda kolom: kolom if kolom == 'bulan' else PERIODE['Bulanan']
+    else:
+        potongan = [(HARIAN, tgl_mulai, tgl_selesai)] if tgl_mulai <= tgl_selesai else []
+        kolom_periode = lambda kolom: PERIODE.get(tipe, PERIODE['Harian'])
+    if not potongan:
+        return None
+    sub, params = _union_potongan(potongan, kolom_periode)
+    return f"""
+        SELECT periode, SUM(jumlah_order), SUM(pendapatan)
+        FROM ({sub})
+        GROUP BY periode
+        ORDER BY periode DESC
+    """, params
+
+
+# Semua laporan yang bisa dicetak, urut seperti di menu Cetak
+LAPORAN = {}
+
+
+def daftar(definisi):
+    """Tambahkan laporan ke LAPORAN; menu Cetak dan Cetak Semua ikut memakainya"""
+    LAPORAN[definisi.nama] = definisi
+    return definisi
+
+
+def buka(nama, *parameter):
+    """Dataset laporan `nama` dengan baris Aliran: query baru jalan saat baris diiterasi"""
+    definisi = LAPORAN[nama]
+    keterangan = definisi.keterangan(*parameter) if definisi.keterangan else ""
+    kolom = definisi.kolom(*parameter) if callable(definisi.kolom) else definisi.kolom
+    return Dataset((nama, *parameter), definisi, keterangan, kolom,
+                   Aliran(kolom, definisi.query(*parameter)))
+
+
+def buat(nama, *parameter):
+    """Jalankan query laporan `nama` dan kembalikan Dataset-nya dengan semua baris di list"""
+    ds = buka(nama, *parameter)
+    return ds._replace(baris=list(ds.baris))
+
+
+def ada_data(nama, *parameter):
+    """True jika query laporan `nama` punya minimal satu baris"""
+    query = LAPORAN[nama].query(*parameter)
+    if query is None:
+        return False
+    sql, params = query
+    with database.cursor() as c:
+        c.execute(f"SELECT EXISTS ({sql})", params)
+        return bool(c.fetchone()[0])
+
+
+daftar(Laporan(
+    'dashboard', "DASHBOARD HARIAN LAUNDRY", "📊 Cetak Dashboard Harian", "dashboard_harian.pdf",
+    kolom=(Kolom("Status"), Kolom("ID", int, lebar=0.5), Kolom("Pelanggan", lebar=2),
+           Kolom("Layanan", lebar=1.5), Kolom("Berat (kg)", float), Kolom("Biaya", Rupiah, True)),
+    query=lambda tanggal: ("""
+        SELECT o.status, o.id, p.nama, o.layanan, o.berat, o.biaya
+        FROM orders o JOIN pelanggan p ON o.pelanggan_id = p.id
+        WHERE o.tanggal = ?
+        ORDER BY +o.status, o.id  -- "+": pakai indeks tanggal, bukan memindai idx_orders_status
+    """, (tanggal,)),
+    parameter=('tanggal',),
+    keterangan=lambda tanggal: f"Tanggal: {_tanggal(tanggal):%d-%m-%Y}",
+    grup=0, satuan="order"))
+
+daftar(Laporan(
+    'pelanggan', "DAFTAR PELANGGAN LAUNDRY", "👥 Cetak Daftar Pelanggan", "daftar_pelanggan.pdf",
+    kolom=(Kolom("ID", int, lebar=0.5), Kolom("Nama", lebar=2), Kolom("Alamat", lebar=2.5),
+           Kolom("Telepon", lebar=1.3), Kolom("Email", lebar=2)),
+    query=lambda: ("SELECT id, nama, alamat, telepon, email FROM pelanggan ORDER BY id", ()),
+    satuan="pelanggan"))
+
+daftar(Laporan(
+    'order', "DAFTAR ORDER LAUNDRY", "🧾 Cetak Daftar Order", "daftar_order.pdf",
+    kolom=(Kolom("ID", int, lebar=0.6), Kolom("Pelanggan", lebar=2), Kolom("Tanggal", lebar=1.2),
+           Kolom("Status"), Kolom("Layanan", lebar=1.3), Kolom("Berat (kg)", float, True),
+           Kolom("Biaya", Rupiah, True, 1.2)),
+    query=lambda: ("""
+        SELECT o.id, p.nama, o.tanggal, o.status, o.layanan, o.berat, o.biaya
+        FROM orders o JOIN pelanggan p ON o.pelanggan_id = p.id
+        ORDER BY o.tanggal DESC, o.id DESC
+    """, ()),
+    satuan="order"))
+
+daftar(Laporan(
+    'inventory', "DAFTAR INVENTORY LAUNDRY", "📦 Cetak Daftar Inventory", "daftar_inventory.pdf",
+    kolom=(Kolom("ID", int, lebar=0.5), Kolom("Nama Barang", lebar=2.5), Kolom("Stok", int, True, 0.7),
+           Kolom("Harga Beli", Rupiah), Kolom("Total Nilai", Rupiah, True)),
+    query=lambda: ("SELECT id, nama, stok, harga_beli, stok * harga_beli FROM inventory ORDER BY id", ()),
+    satuan="item"))
+
+daftar(Laporan(
+    'pembayaran', "DAFTAR PEMBAYARAN LAUNDRY", "💳 Cetak Daftar Pembayaran", "daftar_pembayaran.pdf",
+    kolom=(Kolom("ID", int, lebar=0.5), Kolom("ID Order", int, lebar=0.6), Kolom("Pelanggan", lebar=2),
+           Kolom("Tanggal Bayar", lebar=1.6), Kolom("Jumlah Bayar", Rupiah, True, 1.2),
+           Kolom("Kembalian", Rupiah, True, 1.2)),
+    query=lambda: ("""
+        SELECT b.id, b.order_id, p.nama, b.tanggal, b.jumlah_bayar, b.kembalian
+        FROM pembayaran b
+        LEFT JOIN orders o ON b.order_id = o.id
+        LEFT JOIN pelanggan p ON o.pelanggan_id = p.id
+        ORDER BY b.id
+    """, ()),
+    satuan="pembayaran"))
+
+daftar(Laporan(
+    'pendapatan', "LAPORAN PENDAPATAN LAUNDRY", "💰 Cetak Laporan Pendapatan", "laporan_pendapatan.pdf",
+    kolom=lambda tgl_mulai, tgl_selesai, tipe: (
+        Kolom({'Mingguan': "Minggu (Senin)", 'Bulanan': "Bulan"}.get(tipe, "Tanggal")),
+        Kolom("Jumlah Order", int, True), Kolom("Total Pendapatan", Rupiah, True)),
+    query=_sql_pendapatan,
+    parameter=('tgl_mulai', 'tgl_selesai', 'tipe'),
+    keterangan=_periode, satuan="periode", tampil=True))
+
+daftar(Laporan(
+    'status', "LAPORAN STATUS ORDER LAUNDRY", "📈 Cetak Laporan Status Order", "laporan_status_order.pdf",
+    kolom=(Kolom("Status Order"), Kolom("Jumlah Order", int, True), Kolom("Total Biaya", Rupiah, True)),
+    query=_sql_status,
+    parameter=('tgl_mulai', 'tgl_selesai'),
+    keterangan=_periode, satuan="status", tampil=True))
+
+
+class Dashboard(NamedTuple):
+    """Isi tab Dashboard untuk satu tanggal"""
+    orders: list        # (id, nama pelanggan, status, biaya, tanggal)
+    total_order: int
+    order_selesai: int
+
+
+def dashboard(tanggal):
+    """Order dan statistik pada tanggal (yyyy-mm-dd) untuk tab Dashboard"""
+    with database.cursor() as c:
+        c.execute("SELECT o.id, p.nama, status, biaya, tanggal FROM orders o JOIN pelanggan p ON o.pelanggan_id = p.id WHERE tanggal=?", (tanggal,))
+        orders = c.fetchall()
+        c.execute("SELECT COALESCE(SUM(jumlah_order), 0), "
+                  "COALESCE(SUM(CASE WHEN status='Selesai' THEN jumlah_order END), 0) "
+                  "FROM ringkasan_harian WHERE tanggal=?", (tanggal,))
+        total_order, order_selesai = c.fetchone()
+    return Dashboard(orders, total_order, order_selesai)
+
+
+class Invoice(NamedTuple):
+    """Isi satu invoice/struk"""
+    id: int
+    nama: str
+    telepon: str
+    layanan: str
+    berat: float
+    biaya: Rupiah
+    tanggal: str
+    status: str
+
+    @property
+    def selesai(self):
+        """Perkiraan tanggal selesai dari lama_hari layanan di katalog; None jika layanan/tanggal tidak ada"""
+        layanan = katalog.cari(self.layanan)
+        if layanan and self.tanggal:
+            return _tanggal(self.tanggal) + timedelta(days=layanan.lama_hari)
+
+
+_SQL_INVOICE = """
+    SELECT o.id, p.nama, p.telepon, o.layanan, o.berat, o.biaya, o.tanggal, o.status
+    FROM orders o
+    JOIN pelanggan p ON o.pelanggan_id = p.id
+"""
+
+# Batas parameter per query (SQLITE_MAX_VARIABLE_NUMBER di SQLite lama = 999)
+MAKS_PARAMETER = 500
+
+
+def _invoice(row):
+    return Invoice(*row[:5], Rupiah(row[5]), *row[6:])
+
+
+def invoice(order_ids=None, tanggal=None):
+    """Data invoice untuk banyak order sekaligus (per id atau semua order pada tanggal), urut id"""
+    with database.cursor() as c:
+        if tanggal is not None:
+            c.execute(_SQL_INVOICE + " WHERE o.tanggal = ? ORDER BY o.id", (tanggal,))
+            return [_invoice(r) for r in c.fetchall()]
+        ids = sorted(set(order_ids))
+        hasil = []
+        for i in range(0, len(ids), MAKS_PARAMETER):
+            potongan = ids[i:i + MAKS_PARAMETER]
+            tanda = ",".join("?" * len(potongan))
+            c.execute(_SQL_INVOICE + f" WHERE o.id IN ({tanda}) ORDER BY o.id", potongan)
+            hasil += [_invoice(r) for r in c.fetchall()]
+        return hasil
+
+
+def pembayaran_terakhir(order_id):
+    """(jumlah_bayar, kembalian) pembayaran terakhir order, atau None jika belum dibayar"""
+    with database.cursor() as c:
+        c.execute("SELECT jumlah_bayar, kembalian FROM pembayaran WHERE order_id=? ORDER BY id DESC LIMIT 1",
+                  (order_id,))
+        row = c.fetchone()
+    return (Rupiah(row[0]), Rupiah(row[1])) if row else None
@@ -1,15 +1,17 @@
+import multiprocessing
+import os
 import sqlite3
 from datetime import datetime
 import sys
-import shutil
-import csv
 
 # Import PyQt5
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QDialog, QMessageBox, 
                              QTableWidgetItem, QInputDialog, QFileDialog,
-                             QPushButton, QVBoxLayout, QAction, QMenu, QComboBox)
-from PyQt5.QtGui import QValidator, QIntValidator, QDoubleValidator
-from PyQt5.QtCore import Qt, QDate
+                             QPushButton, QVBoxLayout, QAction, QMenu, QComboBox,
+                             QTableView, QAbstractItemView, QCompleter, QCheckBox,
+                             QProgressDialog, QShortcut)
+from PyQt5.QtGui import QKeySequence, QValidator, QIntValidator, QDoubleValidator, QStandardItemModel, QStandardItem
+from PyQt5.QtCore import Qt, QDate, QTimer, QModelIndex
 
 # Import UI files
 from main_window import Ui_MainWindow
@@ -18,37 +20,18 @@ from pelanggan_dialog import Ui_PelangganDialog
 from order_dialog import Ui_OrderDialog
 from inventory_dialog import Ui_InventoryDialog
 
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 
-def init_db():
-    try:
-        conn = sqlite3.connect('laundry.db')
-        c = conn.cursor()
-        # Tabel Users
-        c.execute('''CREATE TABLE IF NOT EXISTS users
-                     (id INTEGER PRIMARY KEY, username TEXT UNIQUE, password TEXT, role TEXT)''')
-        try:
-            c.execute("INSERT INTO users (username, password, role) VALUES ('admin', 'admin123', 'admin')")
-        except sqlite3.IntegrityError:
-            pass
-        # Tabel Pelanggan
-        c.execute('''CREATE TABLE IF NOT EXISTS pelanggan
-                     (id INTEGER PRIMARY KEY, nama TEXT, alamat TEXT, telepon TEXT, email TEXT)''')
-        # Tabel Orders
-        c.execute('''CREATE TABLE IF NOT EXISTS orders
-                     (id INTEGER PRIMARY KEY, pelanggan_id INTEGER, tanggal TEXT, layanan TEXT, berat REAL, biaya REAL, status TEXT, FOREIGN KEY(pelanggan_id) REFERENCES pelanggan(id))''')
-        # Tabel Inventory
-        c.execute('''CREATE TABLE IF NOT EXISTS inventory
-                     (id INTEGER PRIMARY KEY, nama TEXT, stok INTEGER, harga_beli REAL)''')
-        # Tabel Pembayaran
-        c.execute('''CREATE TABLE IF NOT EXISTS pembayaran
-                     (id INTEGER PRIMARY KEY, order_id INTEGER, tanggal TEXT, jumlah_bayar REAL, kembalian REAL, FOREIGN KEY(order_id) REFERENCES orders(id))''')
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Database Error: {e}")
-    finally:
-        conn.close()
+import database
+import laporan
+import katalog
+import harga
+import cetak
+import struk
+from uang import Rupiah
+from table_models import OrderTableModel, PelangganTableModel, InventoryTableModel
+from database import init_db
+from pekerja import Pelaksana, PelaksanaProses
+from perubahan import bus, INSERT, UPDATE, DELETE
 
 # --- CLASS LOGIN DIALOG ---
 class LoginDialog(QDialog, Ui_LoginDialog):
@@ -64,11 +47,9 @@ class LoginDialog(QDialog, Ui_LoginDialog):
             QMessageBox.warning(self, "Error", "Username dan password wajib diisi")
             return
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            c.execute("SELECT * FROM users WHERE username=? AND password=?", (username, password))
-            user = c.fetchone()
-            conn.close()
+            with database.cursor() as c:
+                c.execute("SELECT * FROM users WHERE username=? AND password=?", (username, password))
+                user = c.fetchone()
             if user:
                 self.accept()
             else:
@@ -82,6 +63,9 @@ class PelangganDialog(QDialog, Ui_PelangganDialog):
         super().__init__()
         self.setupUi(self)
         self.pelanggan_id = pelanggan_id
+        self.hasil = None  # rekaman yang disimpan, diisi saat simpan berhasil
+        self.memberCheckBox = QCheckBox("Member (dapat diskon)", self.groupBox_pelanggan)
+        self.formLayout.addRow("", self.memberCheckBox)
         self.simpanButton.clicked.connect(self.simpan)
         self.batalButton.clicked.connect(self.reject)
         if pelanggan_id:
@@ -89,16 +73,15 @@ class PelangganDialog(QDialog, Ui_PelangganDialog):
 
     def load_data(self):
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            c.execute("SELECT nama, alamat, telepon, email FROM pelanggan WHERE id=?", (self.pelanggan_id,))
-            data = c.fetchone()
-            conn.close()
+            with database.cursor() as c:
+                c.execute("SELECT nama, alamat, telepon, email, member FROM pelanggan WHERE id=?", (self.pelanggan_id,))
+                data = c.fetchone()
             if data:
                 self.namaLineEdit.setText(data[0])
                 self.alamatLineEdit.setText(data[1])
                 self.teleponLineEdit.setText(data[2])
                 self.emailLineEdit.setText(data[3])
+                self.memberCheckBox.setChecked(bool(data[4]))
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
 
@@ -107,100 +90,164 @@ class PelangganDialog(QDialog, Ui_PelangganDialog):
         alamat = self.alamatLineEdit.text().strip()
         telepon = self.teleponLineEdit.text().strip()
         email = self.emailLineEdit.text().strip()
+        member = int(self.memberCheckBox.isChecked())
         if not nama:
             QMessageBox.warning(self, "Error", "Nama wajib diisi")
             return
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            if self.pelanggan_id:
-                c.execute("UPDATE pelanggan SET nama=?, alamat=?, telepon=?, email=? WHERE id=?", (nama, alamat, telepon, email, self.pelanggan_id))
-            else:
-                c.execute("INSERT INTO pelanggan (nama, alamat, telepon, email) VALUES (?, ?, ?, ?)", (nama, alamat, telepon, email))
-            conn.commit()
-            conn.close()
+            with database.transaksi() as c:
+                if self.pelanggan_id:
+                    c.execute("UPDATE pelanggan SET nama=?, alamat=?, telepon=?, email=?, member=? WHERE id=?", (nama, alamat, telepon, email, member, self.pelanggan_id))
+                    pelanggan_id, operasi = self.pelanggan_id, UPDATE
+                else:
+                    c.execute("INSERT INTO pelanggan (nama, alamat, telepon, email, member) VALUES (?, ?, ?, ?, ?)", (nama, alamat, telepon, email, member))
+                    pelanggan_id, operasi = c.lastrowid, INSERT
+            self.hasil = {'id': pelanggan_id, 'nama': nama, 'alamat': alamat, 'telepon': telepon, 'email': email, 'member': member}
+            bus.kirim('pelanggan', pelanggan_id, operasi, self.hasil)
             self.accept()
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
 
 # --- CLASS ORDER DIALOG ---
 class OrderDialog(QDialog, Ui_OrderDialog):
+    MAKS_SARAN = 20  # jumlah saran pelanggan maksimal di popup
+
     def __init__(self, order_id=None):
         super().__init__()
         self.setupUi(self)
         self.order_id = order_id
-        self.load_pelanggan()
+        self.hasil = None  # rekaman yang disimpan, diisi saat simpan berhasil
+        self.biaya = Rupiah(0)  # biaya yang disimpan; totalBiayaLineEdit hanya tampilannya
+        self.setup_cari_pelanggan()
+        self.load_layanan()
+        self.expressCheckBox = QCheckBox("Express", self.groupBox_order)
+        self.formLayout.insertRow(3, "", self.expressCheckBox)
         self.beratLineEdit.setValidator(QDoubleValidator(0.0, 1000.0, 2))
         self.beratLineEdit.textChanged.connect(self.hitung_biaya)
         self.layananComboBox.currentIndexChanged.connect(self.hitung_biaya)
+        self.expressCheckBox.toggled.connect(self.hitung_biaya)
         self.simpanButton.clicked.connect(self.simpan)
         self.batalButton.clicked.connect(self.reject)
         if order_id:
             self.load_data()
 
-    def load_pelanggan(self):
+    def setup_cari_pelanggan(self):
+        """Pelanggan dicari sambil mengetik, tidak dimuat semua saat dialog dibuka"""
+        self.pelanggan_id = None
+        self.pelanggan_nama = None
+        self.pelanggan_member = False
+        self.pelangganComboBox.setEditable(True)
+        self.pelangganComboBox.setInsertPolicy(QComboBox.NoInsert)
+        self.pelangganComboBox.lineEdit().setPlaceholderText("Ketik nama / telepon / alamat...")
+        
+        self.saranPelanggan = QStandardItemModel(self)
+        completer = QCompleter(self.saranPelanggan, self)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)  # sudah difilter di SQL
+        completer.activated[QModelIndex].connect(self.pilih_pelanggan)
+        self.pelangganComboBox.lineEdit().setCompleter(completer)
+        
+        self.cariPelangganTimer = QTimer(self)
+        self.cariPelangganTimer.setSingleShot(True)
+        self.cariPelangganTimer.setInterval(200)
+        self.cariPelangganTimer.timeout.connect(self.cari_pelanggan)
+        self.pelangganComboBox.lineEdit().textEdited.connect(self.ketik_pelanggan)
+
+    def ketik_pelanggan(self):
+        # Teks diubah: pilihan lama tidak berlaku sampai saran dipilih lagi
+        self.pelanggan_id = None
+        self.cariPelangganTimer.start()
+
+    def cari_pelanggan(self):
+        try:
+            hasil = database.cari_pelanggan(self.pelangganComboBox.currentText(), self.MAKS_SARAN)
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        self.saranPelanggan.clear()
+        for pelanggan_id, nama, telepon in hasil:
+            item = QStandardItem(f"{nama} ({telepon})" if telepon else str(nama))
+            item.setData(pelanggan_id, Qt.UserRole)
+            item.setData(nama, Qt.UserRole + 1)
+            self.saranPelanggan.appendRow(item)
+        if hasil:
+            self.pelangganComboBox.lineEdit().completer().complete()
+
+    def pilih_pelanggan(self, index):
+        self.pelanggan_id = index.data(Qt.UserRole)
+        self.pelanggan_nama = index.data(Qt.UserRole + 1)
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            c.execute("SELECT id, nama FROM pelanggan")
-            pelanggan = c.fetchall()
-            conn.close()
-            self.pelangganComboBox.clear()
-            for p in pelanggan:
-                self.pelangganComboBox.addItem(p[1], p[0])
+            with database.cursor() as c:
+                c.execute("SELECT member FROM pelanggan WHERE id=?", (self.pelanggan_id,))
+                data = c.fetchone()
+            self.pelanggan_member = bool(data and data[0])
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
+        self.hitung_biaya()
+
+    def load_layanan(self):
+        """Pilihan layanan dari katalog di database (cache, tanpa query setiap dialog dibuka)"""
+        self.layananComboBox.clear()
+        for layanan in katalog.aktif():
+            self.layananComboBox.addItem(layanan.nama)
 
     def hitung_biaya(self):
         try:
             text_berat = self.beratLineEdit.text().replace(',', '.')
             berat = float(text_berat or 0)
             layanan = self.layananComboBox.currentText()
-            harga_per_kg = {'Cuci Kering': 5000, 'Setrika': 3000, 'Cuci Basah': 4000}.get(layanan, 0)
-            total = berat * harga_per_kg
-            self.totalBiayaLineEdit.setText(f"Rp {total}")
+            # Tier, diskon member, express dan minimum dari aturan yang sudah dikompilasi
+            self.biaya = harga.hitung(layanan, berat, self.pelanggan_member, self.expressCheckBox.isChecked())
         except ValueError:
-            self.totalBiayaLineEdit.setText("Rp 0")
+            self.biaya = Rupiah(0)
+        self.totalBiayaLineEdit.setText(str(self.biaya))
 
     def load_data(self):
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            c.execute("SELECT pelanggan_id, layanan, berat, biaya FROM orders WHERE id=?", (self.order_id,))
-            data = c.fetchone()
-            conn.close()
+            with database.cursor() as c:
+                c.execute("SELECT o.pelanggan_id, o.layanan, o.berat, o.biaya, p.nama, p.member, o.express FROM orders o LEFT JOIN pelanggan p ON o.pelanggan_id = p.id WHERE o.id=?", (self.order_id,))
+                data = c.fetchone()
             if data:
-                index = self.pelangganComboBox.findData(data[0])
-                self.pelangganComboBox.setCurrentIndex(index)
+                self.pelanggan_id, self.pelanggan_nama = data[0], data[4]
+                self.pelanggan_member = bool(data[5])
+                self.expressCheckBox.setChecked(bool(data[6]))
+                self.pelangganComboBox.setEditText(data[4] or "")
+                if self.layananComboBox.findText(data[1]) < 0:
+                    self.layananComboBox.addItem(data[1])  # layanan yang sudah tidak ditawarkan
                 self.layananComboBox.setCurrentText(data[1])
                 self.beratLineEdit.setText(str(data[2]))
-                self.totalBiayaLineEdit.setText(f"Rp {data[3]}")
+                self.biaya = Rupiah(data[3])
+                self.totalBiayaLineEdit.setText(str(self.biaya))
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
 
     def simpan(self):
-        pelanggan_id = self.pelangganComboBox.currentData()
+        pelanggan_id = self.pelanggan_id
         layanan = self.layananComboBox.currentText()
+        express = int(self.expressCheckBox.isChecked())
         try:
             berat = float(self.beratLineEdit.text().replace(',', '.') or 0)
-            biaya = float(self.totalBiayaLineEdit.text().replace("Rp ", "") or 0)
-        except:
-            QMessageBox.warning(self, "Error", "Input berat/biaya tidak valid")
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Input berat tidak valid")
             return
 
+        biaya = self.biaya
         tanggal = datetime.now().strftime("%Y-%m-%d")
         if not pelanggan_id or berat <= 0 or not layanan:
             QMessageBox.warning(self, "Error", "Lengkapi data order")
             return
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            if self.order_id:
-                c.execute("UPDATE orders SET pelanggan_id=?, tanggal=?, layanan=?, berat=?, biaya=? WHERE id=?", (pelanggan_id, tanggal, layanan, berat, biaya, self.order_id))
-            else:
-                c.execute("INSERT INTO orders (pelanggan_id, tanggal, layanan, berat, biaya, status) VALUES (?, ?, ?, ?, ?, 'Masuk')", (pelanggan_id, tanggal, layanan, berat, biaya))
-            conn.commit()
-            conn.close()
+            with database.transaksi() as c:
+                if self.order_id:
+                    c.execute("UPDATE orders SET pelanggan_id=?, tanggal=?, layanan=?, berat=?, biaya=?, express=? WHERE id=?", (pelanggan_id, tanggal, layanan, berat, biaya, express, self.order_id))
+                    order_id, operasi = self.order_id, UPDATE
+                else:
+                    c.execute("INSERT INTO orders (pelanggan_id, tanggal, layanan, berat, biaya, express, status) VALUES (?, ?, ?, ?, ?, ?, 'Masuk')", (pelanggan_id, tanggal, layanan, berat, biaya, express))
+                    order_id, operasi = c.lastrowid, INSERT
+            self.hasil = {'id': order_id, 'pelanggan_id': pelanggan_id, 'pelanggan': self.pelanggan_nama,
+                          'tanggal': tanggal, 'layanan': layanan, 'berat': berat, 'biaya': biaya, 'express': express}
+            if operasi == INSERT:
+                self.hasil['status'] = 'Masuk'
+            bus.kirim('orders', order_id, operasi, self.hasil)
             self.accept()
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -211,8 +258,9 @@ class InventoryDialog(QDialog, Ui_InventoryDialog):
         super().__init__()
         self.setupUi(self)
         self.inventory_id = inventory_id
+        self.hasil = None  # rekaman yang disimpan, diisi saat simpan berhasil
         self.stokLineEdit.setValidator(QIntValidator(0, 10000))
-        self.hargaBeliLineEdit.setValidator(QDoubleValidator(0.0, 1000000.0, 2))
+        self.hargaBeliLineEdit.setValidator(QIntValidator(0, 1000000))  # rupiah bulat
         self.simpanButton.clicked.connect(self.simpan)
         self.batalButton.clicked.connect(self.reject)
         if inventory_id:
@@ -220,11 +268,9 @@ class InventoryDialog(QDialog, Ui_InventoryDialog):
 
     def load_data(self):
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            c.execute("SELECT nama, stok, harga_beli FROM inventory WHERE id=?", (self.inventory_id,))
-            data = c.fetchone()
-            conn.close()
+            with database.cursor() as c:
+                c.execute("SELECT nama, stok, harga_beli FROM inventory WHERE id=?", (self.inventory_id,))
+                data = c.fetchone()
             if data:
                 self.namaLineEdit.setText(data[0])
                 self.stokLineEdit.setText(str(data[1]))
@@ -235,30 +281,70 @@ class InventoryDialog(QDialog, Ui_InventoryDialog):
     def simpan(self):
         nama = self.namaLineEdit.text().strip()
         stok = int(self.stokLineEdit.text() or 0)
-        harga_beli = float(self.hargaBeliLineEdit.text().replace(',', '.') or 0)
+        harga_beli = Rupiah(self.hargaBeliLineEdit.text())
         if not nama or stok < 0:
             QMessageBox.warning(self, "Error", "Nama dan stok wajib valid")
             return
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            if self.inventory_id:
-                c.execute("UPDATE inventory SET nama=?, stok=?, harga_beli=? WHERE id=?", (nama, stok, harga_beli, self.inventory_id))
-            else:
-                c.execute("INSERT INTO inventory (nama, stok, harga_beli) VALUES (?, ?, ?)", (nama, stok, harga_beli))
-            conn.commit()
-            conn.close()
+            with database.transaksi() as c:
+                if self.inventory_id:
+                    c.execute("UPDATE inventory SET nama=?, stok=?, harga_beli=? WHERE id=?", (nama, stok, harga_beli, self.inventory_id))
+                    inventory_id, operasi = self.inventory_id, UPDATE
+                else:
+                    c.execute("INSERT INTO inventory (nama, stok, harga_beli) VALUES (?, ?, ?)", (nama, stok, harga_beli))
+                    inventory_id, operasi = c.lastrowid, INSERT
+            self.hasil = {'id': inventory_id, 'nama': nama, 'stok': stok, 'harga_beli': harga_beli}
+            bus.kirim('inventory', inventory_id, operasi, self.hasil)
             self.accept()
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
 
 # --- CLASS MAIN WINDOW ---
 class MainWindow(QMainWindow, Ui_MainWindow):
+    # Tab yang menampilkan isi setiap tabel, dimuat ulang jika tabel itu berubah
+    TAB_TABEL = {
+        'pelanggan': ('tabPelanggan', 'tabOrder', 'tabDashboard'),
+        'orders': ('tabOrder', 'tabDashboard'),
+        'inventory': ('tabInventory',),
+    }
+    # Model yang bisa diperbarui per baris: tabel -> (atribut model, tab model)
+    MODEL_TABEL = {
+        'orders': ('orderModel', 'tabOrder'),
+        'pelanggan': ('pelangganModel', 'tabPelanggan'),
+        'inventory': ('inventoryModel', 'tabInventory'),
+    }
+
     def __init__(self):
         super().__init__()
         self.setupUi(self)
         init_db()
         
+        # Query dan pembuatan laporan berjalan di thread pekerja agar jendela tidak macet
+        self.pekerja = Pelaksana(self)
+        # PDF untuk "Cetak Semua Laporan" ditulis paralel di beberapa proses (reportlab CPU-bound)
+        self.proses = PelaksanaProses(self, initializer=cetak.siapkan_proses,
+                                      initargs=(os.path.abspath(database.DB_PATH),))
+        self.laporan_data = None  # laporan.Dataset yang tampil di laporanTable
+        
+        # Tabel besar memakai model yang memuat data per halaman
+        self.setStyleSheet(self.styleSheet().replace("QTableWidget {", "QTableView {"))
+        self.orderModel = OrderTableModel(self)
+        self.orderTable = self.pasang_model(self.orderTable, self.orderModel)
+        self.pelangganModel = PelangganTableModel(self)
+        self.pelangganTable = self.pasang_model(self.pelangganTable, self.pelangganModel)
+        self.inventoryModel = InventoryTableModel(self)
+        self.inventoryTable = self.pasang_model(self.inventoryTable, self.inventoryModel)
+        self.orderTable.setSelectionMode(QAbstractItemView.ExtendedSelection)  # untuk cetak invoice banyak order
+        for kunci, model in (('order', self.orderModel), ('pelanggan', self.pelangganModel),
+                             ('inventory', self.inventoryModel)):
+            model.pemuat = lambda model, kunci=kunci: self.muat_latar(kunci, model)
+        
+        # Pencarian pelanggan baru dijalankan setelah berhenti mengetik sebentar
+        self.searchPelangganTimer = QTimer(self)
+        self.searchPelangganTimer.setSingleShot(True)
+        self.searchPelangganTimer.setInterval(300)
+        self.searchPelangganTimer.timeout.connect(self.search_pelanggan)
+        
         # Set tanggal default untuk laporan (30 hari terakhir)
         from_date = QDate.currentDate().addDays(-30)
         to_date = QDate.currentDate()
@@ -267,6 +353,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         
         # Menu Cetak
         self.setup_menu_cetak()
+        self.setup_menu_ekspor()
         
         # Connections
         self.actionExit.triggered.connect(sys.exit)
@@ -279,7 +366,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.tambahPelangganButton.clicked.connect(self.tambah_pelanggan)
         self.editPelangganButton.clicked.connect(self.edit_pelanggan)
         self.hapusPelangganButton.clicked.connect(self.hapus_pelanggan)
-        self.searchPelangganLineEdit.textChanged.connect(self.search_pelanggan)
+        self.searchPelangganLineEdit.textChanged.connect(self.searchPelangganTimer.start)
         
         # Order
         self.buatOrderButton.clicked.connect(self.tambah_order)
@@ -297,143 +384,212 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # Laporan
         self.generateLaporanButton.clicked.connect(self.generate_laporan_pendapatan)
         self.eksporCsvButton.clicked.connect(self.ekspor_laporan_csv)
-        self.eksporPdfButton.clicked.connect(self.cetak_laporan_pendapatan_pdf)  # Ubah ke fungsi baru
+        self.eksporPdfButton.clicked.connect(lambda: self.cetak_laporan_pdf('pendapatan'))
         
         # Pengaturan
         self.ubahPasswordButton.clicked.connect(self.ubah_password)
         self.backupDbButton.clicked.connect(self.backup_db)
 
-        # Load data awal untuk report
-        self.load_dashboard()
-        self.load_pelanggan()
-        self.load_orders()
-        self.load_inventory()
+        # Data tab dimuat saat tab pertama kali dibuka, bukan semuanya saat start
+        self.pemuat_tab = {
+            self.tabDashboard: self.load_dashboard,
+            self.tabPelanggan: self.load_pelanggan,
+            self.tabOrder: self.load_orders,
+            self.tabInventory: self.load_inventory,
+        }
+        self.tab_usang = set(self.pemuat_tab)  # tab yang belum dimuat atau datanya berubah
+        self.tabWidget.currentChanged.connect(self.muat_tab_aktif)
+        self.muat_tab_aktif()
+        
+        # Perubahan dari jendela ini per baris, dari kasir lain lewat data_version
+        bus.berubah.connect(self.terapkan_perubahan)
+        bus.berubah_luar.connect(harga.invalidasi)
+        bus.berubah_luar.connect(self.data_berubah_luar)
+        bus.pantau()
+        QShortcut(QKeySequence.Refresh, self, self.muat_ulang_tab)
+
+    def pasang_model(self, tabel, model):
+        """Ganti QTableWidget dari Designer dengan QTableView yang memakai model"""
+        view = QTableView(tabel.parentWidget())
+        view.setObjectName(tabel.objectName())
+        view.setModel(model)
+        view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        view.setSelectionMode(QAbstractItemView.SingleSelection)
+        view.horizontalHeader().setDefaultSectionSize(tabel.horizontalHeader().defaultSectionSize())
+        view.verticalHeader().setVisible(tabel.verticalHeader().isVisible())
+        # Klik header -> model.sort() -> ORDER BY di SQL
+        header = view.horizontalHeader()
+        header.setSortIndicator(model.urut_kolom, Qt.DescendingOrder if model.turun else Qt.AscendingOrder)
+        view.setSortingEnabled(True)
+        tabel.parentWidget().layout().replaceWidget(tabel, view)
+        tabel.deleteLater()
+        return view
+
+    def muat_tab_aktif(self, index=None):
+        """Muat tab yang sedang tampil jika belum pernah dimuat atau datanya berubah"""
+        tab = self.tabWidget.currentWidget()
+        if tab in self.tab_usang:
+            self.tab_usang.discard(tab)
+            self.pemuat_tab[tab]()
+
+    def muat_ulang_tab(self):
+        """F5: muat ulang tab yang sedang tampil"""
+        tab = self.tabWidget.currentWidget()
+        if tab in self.pemuat_tab:
+            self.tab_usang.add(tab)
+            self.muat_tab_aktif()
+
+    def data_berubah(self, *tabel, kecuali=None, muat=True):
+        """Tandai tab yang memakai tabel ini usang; tab yang sedang tampil langsung dimuat ulang jika `muat`"""
+        if 'orders' in tabel:
+            self.laporan_data = None  # cetak berikutnya query ulang
+        for nama in tabel:
+            for tab in self.TAB_TABEL[nama]:
+                if tab != kecuali:
+                    self.tab_usang.add(getattr(self, tab))
+        if muat:
+            self.muat_tab_aktif()
+
+    def data_berubah_luar(self):
+        """Kasir lain menyimpan data: semua tab ditandai usang, tapi tabel yang sedang dilihat tidak
+        direset (posisi scroll dan baris terpilih tetap) sampai pindah tab atau tekan F5"""
+        self.data_berubah(*self.TAB_TABEL, muat=False)
+        tab = self.tabWidget.currentWidget()
+        if tab is self.tabDashboard:
+            self.muat_tab_aktif()
+        elif tab in self.tab_usang:
+            self.statusbar.showMessage("Data diubah dari komputer lain - tekan F5 untuk memuat ulang tabel ini")
+
+    def terapkan_perubahan(self, tabel, row_id, operasi, rekaman):
+        """Satu baris berubah: perbarui baris itu di modelnya, tab lain yang terkait ditandai usang"""
+        nama_model, tab_model = self.MODEL_TABEL.get(tabel, (None, None))
+        if nama_model:
+            try:
+                getattr(self, nama_model).terapkan_perubahan(row_id, operasi, rekaman)
+            except sqlite3.Error:
+                tab_model = None  # gagal, muat ulang seluruh tab
+        self.data_berubah(tabel, kecuali=tab_model)
+
+    def pilih_baris(self, view, row_id):
+        """Pilih baris dengan id ini dan scroll seperlunya agar terlihat"""
+        row = view.model().baris_id(row_id)
+        if row is not None:
+            view.selectRow(row)
+            view.scrollTo(view.model().index(row, 0))
+
+    def buka_dialog(self, dialog, view):
+        """Jalankan dialog tambah/edit; baris yang disimpan dipilih di tabel"""
+        if dialog.exec_() == QDialog.Accepted and dialog.hasil:
+            self.pilih_baris(view, dialog.hasil['id'])
+
+    def muat_latar(self, kunci, model):
+        """Ambil halaman pertama model di thread pekerja, pasang di tabel setelah selesai"""
+        self.pekerja.jalankan(kunci, model.halaman_awal,
+                              selesai=model.pasang_halaman_awal, gagal=self.pesan_gagal())
+
+    def pesan_gagal(self, judul="Error", awalan=""):
+        """Callback gagal untuk tugas di thread pekerja"""
+        return lambda e: QMessageBox.critical(self, judul, f"{awalan}{e}")
+
+    def cetak_latar(self, kunci, tulis, pesan):
+        """Tulis PDF di thread pekerja; pesan sukses/gagal muncul setelah selesai"""
+        self.pekerja.jalankan(kunci, tulis,
+                              selesai=lambda _: QMessageBox.information(self, "Sukses", pesan),
+                              gagal=self.pesan_gagal(awalan="Gagal mencetak: "))
 
     # --- SETUP MENU CETAK ---
     def setup_menu_cetak(self):
-        """Setup menu untuk 7 report cetak"""
+        """Menu Cetak: satu aksi per laporan di laporan.LAPORAN, lalu invoice dan cetak semua"""
         self.menuCetak = QMenu("&Cetak", self)
         self.menubar.addMenu(self.menuCetak)
         
-        # 7 Aksi cetak
-        self.actionCetakDashboard = QAction("📊 Cetak Dashboard Harian", self)
-        self.actionCetakDashboard.triggered.connect(self.cetak_dashboard_pdf)
-        self.menuCetak.addAction(self.actionCetakDashboard)
-        
-        self.actionCetakPelanggan = QAction("👥 Cetak Daftar Pelanggan", self)
-        self.actionCetakPelanggan.triggered.connect(self.cetak_daftar_pelanggan_pdf)
-        self.menuCetak.addAction(self.actionCetakPelanggan)
-        
-        self.actionCetakOrder = QAction("🧾 Cetak Daftar Order", self)
-        self.actionCetakOrder.triggered.connect(self.cetak_daftar_order_pdf)
-        self.menuCetak.addAction(self.actionCetakOrder)
-        
-        self.actionCetakInventory = QAction("📦 Cetak Daftar Inventory", self)
-        self.actionCetakInventory.triggered.connect(self.cetak_daftar_inventory_pdf)
-        self.menuCetak.addAction(self.actionCetakInventory)
-        
-        self.actionCetakLaporan = QAction("💰 Cetak Laporan Pendapatan", self)
-        self.actionCetakLaporan.triggered.connect(self.cetak_laporan_pendapatan_pdf)
-        self.menuCetak.addAction(self.actionCetakLaporan)
-        
-        self.actionCetakStatus = QAction("📈 Cetak Laporan Status Order", self)
-        self.actionCetakStatus.triggered.connect(self.cetak_laporan_status_order_pdf)
-        self.menuCetak.addAction(self.actionCetakStatus)
+        for nama, definisi in laporan.LAPORAN.items():
+            aksi = QAction(definisi.menu, self)
+            aksi.triggered.connect(lambda _, nama=nama: self.cetak_laporan_pdf(nama))
+            self.menuCetak.addAction(aksi)
         
         self.actionCetakInvoice = QAction("🧾 Cetak Invoice/Struk", self)
         self.actionCetakInvoice.triggered.connect(self.cetak_invoice)
         self.menuCetak.addAction(self.actionCetakInvoice)
         
+        self.actionCetakStruk = QAction("🖨️ Cetak Struk (Printer Thermal)", self)
+        self.actionCetakStruk.triggered.connect(self.cetak_struk)
+        self.menuCetak.addAction(self.actionCetakStruk)
+        
+        self.actionCetakInvoiceTerpilih = QAction("🧾 Cetak Invoice Order Terpilih", self)
+        self.actionCetakInvoiceTerpilih.triggered.connect(self.cetak_invoice_terpilih)
+        self.menuCetak.addAction(self.actionCetakInvoiceTerpilih)
+        
+        self.actionCetakInvoiceTanggal = QAction("🧾 Cetak Invoice per Tanggal", self)
+        self.actionCetakInvoiceTanggal.triggered.connect(self.cetak_invoice_tanggal)
+        self.menuCetak.addAction(self.actionCetakInvoiceTanggal)
+        
         self.menuCetak.addSeparator()
         
         self.actionCetakSemua = QAction("🖨️ Cetak Semua Laporan", self)
         self.actionCetakSemua.triggered.connect(self.cetak_semua_laporan)
         self.menuCetak.addAction(self.actionCetakSemua)
 
+    def setup_menu_ekspor(self):
+        """Menu Ekspor: setiap laporan di laporan.LAPORAN bisa diekspor ke CSV langsung dari database"""
+        self.menuEkspor = QMenu("&Ekspor", self)
+        self.menubar.addMenu(self.menuEkspor)
+        
+        for nama, definisi in laporan.LAPORAN.items():
+            aksi = QAction(f"{definisi.judul.title()} (CSV)", self)
+            aksi.triggered.connect(lambda _, nama=nama: self.ekspor_csv(nama))
+            self.menuEkspor.addAction(aksi)
+
     # --- REPORT 1: DASHBOARD HARIAN (TAMPIL) ---
     def load_dashboard(self):
         """REPORT 1: Dashboard - Order Hari Ini"""
-        try:
-            today = datetime.now().date().isoformat()
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            c.execute("SELECT o.id, p.nama, status, biaya, tanggal FROM orders o JOIN pelanggan p ON o.pelanggan_id = p.id WHERE tanggal=?", (today,))
-            orders = c.fetchall()
-            self.dashboardTable.setRowCount(len(orders))
-            total = 0
-            for row, order in enumerate(orders):
-                for col, val in enumerate(order):
-                    self.dashboardTable.setItem(row, col, QTableWidgetItem(str(val)))
-                total += order[3]
-            self.totalLabel.setText(f"Total Pendapatan Hari Ini: Rp {total}")
-            
-            # Statistik tambahan
-            c.execute("SELECT COUNT(id) FROM orders WHERE tanggal=?", (today,))
-            total_order = c.fetchone()[0]
-            
-            c.execute("SELECT COUNT(id) FROM orders WHERE status='Selesai' AND tanggal=?", (today,))
-            order_selesai = c.fetchone()[0]
-            
-            self.statusbar.showMessage(f"Hari ini: {total_order} order, {order_selesai} selesai, Pendapatan: Rp {total}")
-            conn.close()
-        except sqlite3.Error as e:
-            QMessageBox.critical(self, "Error", str(e))
+        today = datetime.now().date().isoformat()
+        self.pekerja.jalankan('dashboard', laporan.dashboard, today,
+                              selesai=self.tampil_dashboard, gagal=self.pesan_gagal())
+
+    def tampil_dashboard(self, data):
+        self.dashboardTable.setRowCount(len(data.orders))
+        total = Rupiah(0)
+        for row, order in enumerate(data.orders):
+            for col, val in enumerate(order):
+                self.dashboardTable.setItem(row, col, QTableWidgetItem(str(val)))
+            total += order[3] or 0
+        self.totalLabel.setText(f"Total Pendapatan Hari Ini: {total}")
+        self.statusbar.showMessage(f"Hari ini: {data.total_order} order, {data.order_selesai} selesai, Pendapatan: {total}")
 
     # --- REPORT 2: DAFTAR PELANGGAN (TAMPIL) ---
     def load_pelanggan(self):
         """REPORT 2: Daftar Semua Pelanggan"""
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            c.execute("SELECT * FROM pelanggan ORDER BY nama")
-            pelanggan = c.fetchall()
-            self.pelangganTable.setRowCount(len(pelanggan))
-            for row, p in enumerate(pelanggan):
-                for col, val in enumerate(p):
-                    self.pelangganTable.setItem(row, col, QTableWidgetItem(str(val)))
-            conn.close()
+            self.pelangganModel.muat_ulang()
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
 
     def search_pelanggan(self):
-        search = self.searchPelangganLineEdit.text().lower()
-        for row in range(self.pelangganTable.rowCount()):
-            match = False
-            for col in range(self.pelangganTable.columnCount()):
-                item = self.pelangganTable.item(row, col)
-                if item and search in item.text().lower():
-                    match = True
-                    break
-            self.pelangganTable.setRowHidden(row, not match)
+        try:
+            self.pelangganModel.cari(self.searchPelangganLineEdit.text())
+        except sqlite3.Error as e:
+            QMessageBox.critical(self, "Error", str(e))
 
     def tambah_pelanggan(self):
-        dialog = PelangganDialog()
-        if dialog.exec_() == QDialog.Accepted:
-            self.load_pelanggan()
+        self.buka_dialog(PelangganDialog(), self.pelangganTable)
 
     def edit_pelanggan(self):
-        row = self.pelangganTable.currentRow()
-        if row >= 0:
-            pelanggan_id = int(self.pelangganTable.item(row, 0).text())
-            dialog = PelangganDialog(pelanggan_id)
-            if dialog.exec_() == QDialog.Accepted:
-                self.load_pelanggan()
+        pelanggan_id = self.pelangganModel.id_pada(self.pelangganTable.currentIndex().row())
+        if pelanggan_id is not None:
+            self.buka_dialog(PelangganDialog(pelanggan_id), self.pelangganTable)
         else:
             QMessageBox.warning(self, "Error", "Pilih pelanggan dulu")
 
     def hapus_pelanggan(self):
-        row = self.pelangganTable.currentRow()
-        if row >= 0:
-            pelanggan_id = int(self.pelangganTable.item(row, 0).text())
+        pelanggan_id = self.pelangganModel.id_pada(self.pelangganTable.currentIndex().row())
+        if pelanggan_id is not None:
             reply = QMessageBox.question(self, "Konfirmasi", "Yakin hapus?", QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
                 try:
-                    conn = sqlite3.connect('laundry.db')
-                    c = conn.cursor()
-                    c.execute("DELETE FROM pelanggan WHERE id=?", (pelanggan_id,))
-                    conn.commit()
-                    conn.close()
-                    self.load_pelanggan()
+                    with database.transaksi() as c:
+                        c.execute("DELETE FROM pelanggan WHERE id=?", (pelanggan_id,))
+                    bus.kirim('pelanggan', pelanggan_id, DELETE)
                 except sqlite3.Error as e:
                     QMessageBox.critical(self, "Error", str(e))
         else:
@@ -443,37 +599,23 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     def load_orders(self):
         """REPORT 3: Daftar Semua Order"""
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            c.execute("SELECT o.id, p.nama, o.tanggal, o.status, o.biaya, o.layanan FROM orders o JOIN pelanggan p ON o.pelanggan_id = p.id ORDER BY o.tanggal DESC")
-            orders = c.fetchall()
-            self.orderTable.setRowCount(len(orders))
-            for row, order in enumerate(orders):
-                for col, val in enumerate(order):
-                    self.orderTable.setItem(row, col, QTableWidgetItem(str(val)))
-            conn.close()
+            # Hanya halaman pertama; sisanya dimuat saat tabel discroll
+            self.orderModel.muat_ulang()
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
 
     def tambah_order(self):
-        dialog = OrderDialog()
-        if dialog.exec_() == QDialog.Accepted:
-            self.load_orders()
-            self.load_dashboard()
+        self.buka_dialog(OrderDialog(), self.orderTable)
 
     def update_status_order(self):
-        row = self.orderTable.currentRow()
-        if row >= 0:
-            order_id = int(self.orderTable.item(row, 0).text())
+        order_id = self.orderModel.id_pada(self.orderTable.currentIndex().row())
+        if order_id is not None:
             status_baru, ok = QInputDialog.getItem(self, "Update Status", "Pilih status baru:", ["Masuk", "Proses", "Selesai"], 0, False)
             if ok:
                 try:
-                    conn = sqlite3.connect('laundry.db')
-                    c = conn.cursor()
-                    c.execute("UPDATE orders SET status=? WHERE id=?", (status_baru, order_id))
-                    conn.commit()
-                    conn.close()
-                    self.load_orders()
+                    with database.transaksi() as c:
+                        c.execute("UPDATE orders SET status=? WHERE id=?", (status_baru, order_id))
+                    bus.kirim('orders', order_id, UPDATE, {'status': status_baru})
                 except sqlite3.Error as e:
                     QMessageBox.critical(self, "Error", str(e))
         else:
@@ -483,138 +625,80 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     def load_inventory(self):
         """REPORT 4: Daftar Inventory"""
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            c.execute("SELECT * FROM inventory ORDER BY nama")
-            inventory = c.fetchall()
-            self.inventoryTable.setRowCount(len(inventory))
-            for row, i in enumerate(inventory):
-                for col, val in enumerate(i):
-                    self.inventoryTable.setItem(row, col, QTableWidgetItem(str(val)))
-            conn.close()
+            self.inventoryModel.muat_ulang()
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
 
     def tambah_inventory(self):
-        dialog = InventoryDialog()
-        if dialog.exec_() == QDialog.Accepted:
-            self.load_inventory()
+        self.buka_dialog(InventoryDialog(), self.inventoryTable)
 
     def edit_inventory(self):
-        row = self.inventoryTable.currentRow()
-        if row >= 0:
-            inv_id = int(self.inventoryTable.item(row, 0).text())
-            dialog = InventoryDialog(inv_id)
-            if dialog.exec_() == QDialog.Accepted:
-                self.load_inventory()
+        inv_id = self.inventoryModel.id_pada(self.inventoryTable.currentIndex().row())
+        if inv_id is not None:
+            self.buka_dialog(InventoryDialog(inv_id), self.inventoryTable)
         else:
             QMessageBox.warning(self, "Error", "Pilih inventory dulu")
 
     def kurangi_stok(self):
-        row = self.inventoryTable.currentRow()
-        if row >= 0:
-            inv_id = int(self.inventoryTable.item(row, 0).text())
+        inv_id = self.inventoryModel.id_pada(self.inventoryTable.currentIndex().row())
+        if inv_id is not None:
             jumlah, ok = QInputDialog.getInt(self, "Kurangi Stok", "Jumlah:", 1, 1, 1000)
             if ok:
                 try:
-                    conn = sqlite3.connect('laundry.db')
-                    c = conn.cursor()
-                    c.execute("UPDATE inventory SET stok = stok - ? WHERE id=?", (jumlah, inv_id))
-                    conn.commit()
-                    conn.close()
-                    self.load_inventory()
+                    with database.transaksi() as c:
+                        c.execute("UPDATE inventory SET stok = stok - ? WHERE id=?", (jumlah, inv_id))
+                    bus.kirim('inventory', inv_id, UPDATE)
                 except sqlite3.Error as e:
                     QMessageBox.critical(self, "Error", str(e))
 
     # --- REPORT 5: LAPORAN PENDAPATAN (TAMPIL) ---
     def generate_laporan_pendapatan(self):
         """REPORT 5: Laporan Pendapatan Berdasarkan Periode"""
-        tgl_mulai = self.fromDateEdit.date().toString("yyyy-MM-dd")
-        tgl_selesai = self.toDateEdit.date().toString("yyyy-MM-dd")
-        
-        try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            
-            query = """
-                SELECT tanggal, COUNT(id) as jumlah_order, SUM(biaya) as total_pendapatan
-                FROM orders 
-                WHERE tanggal BETWEEN ? AND ?
-                GROUP BY tanggal
-                ORDER BY tanggal DESC
-            """
-            c.execute(query, (tgl_mulai, tgl_selesai))
-            data = c.fetchall()
-            
-            # Set header tabel
-            self.laporanTable.setColumnCount(3)
-            self.laporanTable.setHorizontalHeaderLabels(["Tanggal", "Jumlah Order", "Total Pendapatan"])
-            
-            self.laporanTable.setRowCount(len(data))
-            total_pendapatan = 0
-            
-            for row_idx, row_data in enumerate(data):
-                self.laporanTable.setItem(row_idx, 0, QTableWidgetItem(str(row_data[0])))
-                self.laporanTable.setItem(row_idx, 1, QTableWidgetItem(str(row_data[1])))
-                
-                if row_data[2]:
-                    pendapatan = float(row_data[2])
-                    self.laporanTable.setItem(row_idx, 2, QTableWidgetItem(f"Rp {pendapatan:,.0f}"))
-                    total_pendapatan += pendapatan
-                else:
-                    self.laporanTable.setItem(row_idx, 2, QTableWidgetItem("Rp 0"))
-            
-            conn.close()
-            
-            if not data:
-                QMessageBox.information(self, "Info", f"Tidak ada data pada rentang tanggal {tgl_mulai} sampai {tgl_selesai}")
-            else:
-                self.statusbar.showMessage(f"Total Pendapatan Periode: Rp {total_pendapatan:,.0f} | {tgl_mulai} - {tgl_selesai}")
-                
-        except sqlite3.Error as e:
-            QMessageBox.critical(self, "Database Error", f"Gagal memuat laporan: {str(e)}")
-
-    # --- REPORT 6: LAPORAN STATUS ORDER (TAMPIL) ---
-    def generate_laporan_status(self):
-        """REPORT 6: Laporan Order Berdasarkan Status"""
-        tgl_mulai = self.fromDateEdit.date().toString("yyyy-MM-dd")
-        tgl_selesai = self.toDateEdit.date().toString("yyyy-MM-dd")
+        self.ambil_laporan('pendapatan')
+
+    def parameter_laporan(self, definisi):
+        """Nilai parameter laporan, diambil dari filter di tab Laporan"""
+        nilai = {
+            'tanggal': datetime.now().date().isoformat(),
+            'tgl_mulai': self.fromDateEdit.date().toString("yyyy-MM-dd"),
+            'tgl_selesai': self.toDateEdit.date().toString("yyyy-MM-dd"),
+            'tipe': self.tipeLaporanComboBox.currentText(),
+        }
+        return tuple(nilai[p] for p in definisi.parameter)
+
+    def ambil_laporan(self, nama, lanjut=None):
+        """Jalankan query laporan di thread pekerja; laporan `tampil` ditampilkan di laporanTable.
+
+        lanjut(dataset) dipanggil setelahnya (untuk cetak). Jika dataset dengan
+        parameter yang sama sedang tampil, dataset itu langsung dipakai tanpa query.
+        """
+        definisi = laporan.LAPORAN[nama]
+        args = self.parameter_laporan(definisi)
+        ds = self.laporan_data
+        if lanjut and ds is not None and ds.kunci == (nama, *args):
+            lanjut(ds)
+            return
         
-        try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            
-            query = """
-                SELECT status, COUNT(id) as jumlah_order, SUM(biaya) as total_biaya
-                FROM orders 
-                WHERE tanggal BETWEEN ? AND ?
-                GROUP BY status
-                ORDER BY status
-            """
-            c.execute(query, (tgl_mulai, tgl_selesai))
-            data = c.fetchall()
-            
-            # Set header tabel
-            self.laporanTable.setColumnCount(3)
-            self.laporanTable.setHorizontalHeaderLabels(["Status Order", "Jumlah Order", "Total Biaya"])
-            
-            self.laporanTable.setRowCount(len(data))
-            
-            for row_idx, row_data in enumerate(data):
-                self.laporanTable.setItem(row_idx, 0, QTableWidgetItem(str(row_data[0])))
-                self.laporanTable.setItem(row_idx, 1, QTableWidgetItem(str(row_data[1])))
-                
-                if row_data[2]:
-                    biaya = float(row_data[2])
-                    self.laporanTable.setItem(row_idx, 2, QTableWidgetItem(f"Rp {biaya:,.0f}"))
-                else:
-                    self.laporanTable.setItem(row_idx, 2, QTableWidgetItem("Rp 0"))
-            
-            conn.close()
-            self.statusbar.showMessage(f"Laporan Status Order: {tgl_mulai} - {tgl_selesai}")
-            
-        except sqlite3.Error as e:
-            QMessageBox.critical(self, "Error", f"Gagal memuat laporan: {str(e)}")
+        def selesai(ds):
+            if definisi.tampil:
+                self.tampil_laporan(ds, info_kosong=lanjut is None)
+            if lanjut:
+                lanjut(ds)
+        
+        # Permintaan dari menu cetak tidak membatalkan/dibatalkan tampilan biasa
+        kunci = 'laporan' if lanjut is None else f'cetak_{nama}'
+        self.pekerja.jalankan(kunci, laporan.buat, nama, *args, selesai=selesai,
+                              gagal=self.pesan_gagal("Database Error", "Gagal memuat laporan: "))
+
+    def tampil_laporan(self, ds, info_kosong=True):
+        self.laporan_data = ds
+        cetak.isi_tabel(self.laporanTable, ds)
+        if not ds.baris:
+            if info_kosong:
+                QMessageBox.information(self, "Info", f"Tidak ada data. {ds.keterangan}")
+            return
+        total = ", ".join(f"{k.judul}: {cetak.teks(v)}" for k, v in zip(ds.kolom, ds.total()) if v is not None)
+        self.statusbar.showMessage(f"{ds.judul.title()} | {ds.keterangan} | {total}")
 
     # --- REPORT 7: INVOICE/STRUK (CETAK) ---
     def proses_pembayaran(self):
@@ -624,15 +708,13 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             return
             
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            
             # Cek apakah order ada dan ambil detailnya
-            c.execute("SELECT o.id, p.nama, o.biaya, o.status FROM orders o JOIN pelanggan p ON o.pelanggan_id = p.id WHERE o.id=?", (order_id,))
-            order = c.fetchone()
+            with database.cursor() as c:
+                c.execute("SELECT o.id, p.nama, o.biaya, o.status FROM orders o JOIN pelanggan p ON o.pelanggan_id = p.id WHERE o.id=?", (order_id,))
+                order = c.fetchone()
             
             if order:
-                biaya = order[2]
+                biaya = Rupiah(order[2])
                 status_sekarang = order[3]
                 
                 if status_sekarang == "Selesai":
@@ -641,34 +723,39 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
                 # Ambil nominal bayar dari lineEdit
                 try:
-                    bayar = float(self.bayarLineEdit.text().replace("Rp", "").replace(",", "").strip() or 0)
+                    bayar = Rupiah(self.bayarLineEdit.text())
                 except ValueError:
                     QMessageBox.warning(self, "Input Error", "Masukkan nominal angka yang valid!")
                     return
 
                 if bayar < biaya:
-                    QMessageBox.warning(self, "Gagal", f"Uang kurang! Total biaya adalah Rp {biaya}")
+                    QMessageBox.warning(self, "Gagal", f"Uang kurang! Total biaya adalah {biaya}")
                     return
                 
                 kembalian = bayar - biaya
-                self.kembalianLabel.setText(f"Rp {kembalian}")
                 
-                # Update status order dan simpan ke tabel pembayaran
-                c.execute("UPDATE orders SET status='Selesai' WHERE id=?", (order_id,))
-                c.execute("INSERT INTO pembayaran (order_id, tanggal, jumlah_bayar, kembalian) VALUES (?, ?, ?, ?)",
-                          (order_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), bayar, kembalian))
+                # Update status order dan simpan ke tabel pembayaran. Status dicek lagi di dalam
+                # kunci tulis: kasir lain bisa membayar order yang sama sejak dibaca di atas.
+                with database.transaksi() as c:
+                    c.execute("UPDATE orders SET status='Selesai' WHERE id=? AND status IS NOT 'Selesai'", (order_id,))
+                    lunas = c.rowcount == 0
+                    if not lunas:
+                        c.execute("INSERT INTO pembayaran (order_id, tanggal, jumlah_bayar, kembalian) VALUES (?, ?, ?, ?)",
+                                  (order_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), bayar, kembalian))
+                if lunas:
+                    QMessageBox.information(self, "Info", "Order ini sudah lunas/selesai.")
+                    return
+                self.kembalianLabel.setText(str(kembalian))
+                bus.kirim('orders', order[0], UPDATE, {'status': 'Selesai'})
+                if struk.PRINTER:
+                    self.kirim_struk(order[0], pesan=False)
                 
-                conn.commit()
-                QMessageBox.information(self, "Sukses", f"Pembayaran Berhasil!\nKembalian: Rp {kembalian}")
+                QMessageBox.information(self, "Sukses", f"Pembayaran Berhasil!\nKembalian: {kembalian}")
                 
-                self.load_orders()
-                self.load_dashboard()
                 self.bayarLineEdit.clear()
                 self.kembalianLabel.setText("Rp 0")
             else:
                 QMessageBox.critical(self, "Error", "ID Order tidak ditemukan!")
-                
-            conn.close()
         except Exception as e:
             QMessageBox.critical(self, "Database Error", str(e))
 
@@ -685,561 +772,141 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             return
 
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
-            query = """
-                SELECT o.id, p.nama, p.telepon, o.layanan, o.berat, o.biaya, o.tanggal, o.status
-                FROM orders o 
-                JOIN pelanggan p ON o.pelanggan_id = p.id 
-                WHERE o.id = ?
-            """
-            c.execute(query, (order_id,))
-            data = c.fetchone()
-            conn.close()
-
-            if not data:
+            daftar = laporan.invoice([int(order_id)]) if order_id.isdigit() else []
+            if not daftar:
                 QMessageBox.warning(self, "Error", f"Data untuk ID Order {order_id} tidak ditemukan!")
                 return
 
             # Buat nama file PDF
             file_path = f"Invoice_Order_{order_id}.pdf"
-            c_pdf = canvas.Canvas(file_path, pagesize=letter)
-            width, height = letter
-
-            # Header Invoice
-            c_pdf.setFont("Helvetica-Bold", 18)
-            c_pdf.drawCentredString(width/2, height - 50, "LAUNDRY EXPRESS")
-            c_pdf.setFont("Helvetica", 10)
-            c_pdf.drawCentredString(width/2, height - 70, "Jl. Contoh No. 123, Kota Anda")
-            c_pdf.drawCentredString(width/2, height - 85, "Telp: (021) 1234567")
-            
-            c_pdf.setFont("Helvetica-Bold", 14)
-            c_pdf.drawCentredString(width/2, height - 110, "INVOICE / STRUK PEMBAYARAN")
-            c_pdf.line(50, height - 120, width - 50, height - 120)
-            
-            # Informasi Invoice
-            y = height - 150
-            c_pdf.setFont("Helvetica-Bold", 12)
-            c_pdf.drawString(70, y, "INFORMASI ORDER")
-            c_pdf.setFont("Helvetica", 10)
-            c_pdf.drawString(70, y - 20, f"No. Invoice    : LAUNDRY-{data[0]}")
-            c_pdf.drawString(70, y - 35, f"Tanggal        : {data[6]}")
-            c_pdf.drawString(70, y - 50, f"Status         : {data[7]}")
-            
-            # Informasi Pelanggan
-            c_pdf.setFont("Helvetica-Bold", 12)
-            c_pdf.drawString(70, y - 80, "INFORMASI PELANGGAN")
-            c_pdf.setFont("Helvetica", 10)
-            c_pdf.drawString(70, y - 100, f"Nama           : {data[1]}")
-            c_pdf.drawString(70, y - 115, f"Telepon        : {data[2]}")
-            
-            # Detail Order
-            c_pdf.setFont("Helvetica-Bold", 12)
-            c_pdf.drawString(70, y - 145, "DETAIL ORDER")
-            
-            # Tabel detail
-            table_y = y - 165
-            c_pdf.setFont("Helvetica-Bold", 10)
-            c_pdf.drawString(70, table_y, "Layanan")
-            c_pdf.drawString(200, table_y, "Berat")
-            c_pdf.drawString(300, table_y, "Biaya")
-            
-            c_pdf.line(70, table_y - 5, 400, table_y - 5)
-            
-            c_pdf.setFont("Helvetica", 10)
-            c_pdf.drawString(70, table_y - 20, data[3])
-            c_pdf.drawString(200, table_y - 20, f"{data[4]} kg")
-            c_pdf.drawString(300, table_y - 20, f"Rp {data[5]:,.0f}")
-            
-            # Total
-            c_pdf.setFont("Helvetica-Bold", 12)
-            c_pdf.drawString(250, table_y - 50, "TOTAL BAYAR:")
-            c_pdf.drawString(350, table_y - 50, f"Rp {data[5]:,.0f}")
-            
-            # Garis pemisah
-            c_pdf.line(250, table_y - 55, 450, table_y - 55)
-            
-            # Footer
-            c_pdf.setFont("Helvetica-Oblique", 9)
-            c_pdf.drawCentredString(width/2, table_y - 80, "Terima kasih atas kepercayaan Anda!")
-            c_pdf.drawCentredString(width/2, table_y - 95, "Struk ini sebagai bukti pembayaran yang sah")
-            
-            c_pdf.save()
+            cetak.simpan_invoice(file_path, daftar[0])
             QMessageBox.information(self, "Sukses", f"Invoice berhasil dicetak!\nFile: {file_path}")
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Gagal mencetak invoice: {str(e)}")
 
-    def cetak_laporan_pendapatan_pdf(self):
-        """REPORT 2 CETAK: Cetak Laporan Pendapatan ke PDF"""
-        # Pastikan data sudah digenerate
-        self.generate_laporan_pendapatan()
-        
-        if self.laporanTable.rowCount() == 0:
-            QMessageBox.warning(self, "Peringatan", "Tidak ada data laporan pendapatan!")
+    def cetak_struk(self):
+        """Cetak struk order di orderIdLineEdit langsung ke printer thermal (ESC/POS)"""
+        order_id = self.orderIdLineEdit.text().strip()
+        if not order_id.isdigit():
+            QMessageBox.warning(self, "Peringatan", "Silakan masukkan ID Order terlebih dahulu!")
             return
-    
-        path, _ = QFileDialog.getSaveFileName(self, "Cetak Laporan Pendapatan", 
-                                              "laporan_pendapatan.pdf", "PDF Files (*.pdf)")
-        
-        if path:
-            try:
-                c = canvas.Canvas(path, pagesize=letter)
-                width, height = letter
-                
-                # Header
-                c.setFont("Helvetica-Bold", 16)
-                c.drawCentredString(width/2, height - 50, "LAPORAN PENDAPATAN LAUNDRY")
-                
-                # Periode
-                tgl_mulai = self.fromDateEdit.date().toString("dd-MM-yyyy")
-                tgl_selesai = self.toDateEdit.date().toString("dd-MM-yyyy")
-                c.setFont("Helvetica", 12)
-                c.drawString(100, height - 80, f"Periode: {tgl_mulai} sampai {tgl_selesai}")
-                
-                # Data tabel
-                y = height - 120
-                c.setFont("Helvetica-Bold", 10)
-                c.drawString(100, y, "Tanggal")
-                c.drawString(200, y, "Jumlah Order")
-                c.drawString(300, y, "Total Pendapatan")
-                
-                y -= 20
-                c.setFont("Helvetica", 10)
-                total_pendapatan = 0
-                
-                for row in range(self.laporanTable.rowCount()):
-                    tanggal = self.laporanTable.item(row, 0).text() if self.laporanTable.item(row, 0) else ""
-                    jumlah = self.laporanTable.item(row, 1).text() if self.laporanTable.item(row, 1) else ""
-                    pendapatan_text = self.laporanTable.item(row, 2).text() if self.laporanTable.item(row, 2) else "Rp 0"
-                    
-                    c.drawString(100, y, tanggal)
-                    c.drawString(200, y, jumlah)
-                    c.drawString(300, y, pendapatan_text)
-                    
-                    # Hitung total
-                    if "Rp" in pendapatan_text:
-                        try:
-                            angka = float(pendapatan_text.replace("Rp", "").replace(",", "").strip())
-                            total_pendapatan += angka
-                        except:
-                            pass
-                    
-                    y -= 15
-                
-                # Total
-                c.setFont("Helvetica-Bold", 12)
-                c.drawString(250, y - 20, f"TOTAL: Rp {total_pendapatan:,.0f}")
-                
-                c.save()
-                QMessageBox.information(self, "Sukses", f"Laporan pendapatan dicetak: {path}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Gagal mencetak: {str(e)}")
-
-    def cetak_daftar_pelanggan_pdf(self):
-        """REPORT 3 CETAK: Cetak Daftar Pelanggan ke PDF"""
-        if self.pelangganTable.rowCount() == 0:
-            QMessageBox.warning(self, "Peringatan", "Tidak ada data pelanggan!")
+        if not struk.PRINTER:
+            QMessageBox.warning(self, "Peringatan", "Printer struk belum diatur.\nIsi environment variable "
+                                "LAUNDRY_PRINTER dengan file device printer atau folder spool.")
             return
-        
-        path, _ = QFileDialog.getSaveFileName(self, "Cetak Daftar Pelanggan", 
-                                              "daftar_pelanggan.pdf", "PDF Files (*.pdf)")
-        
-        if path:
-            try:
-                c = canvas.Canvas(path, pagesize=letter)
-                width, height = letter
-                
-                # Header
-                c.setFont("Helvetica-Bold", 16)
-                c.drawCentredString(width/2, height - 50, "DAFTAR PELANGGAN LAUNDRY")
-                c.setFont("Helvetica", 10)
-                c.drawCentredString(width/2, height - 70, f"Jumlah: {self.pelangganTable.rowCount()} pelanggan")
-                
-                # Tabel
-                y = height - 100
-                headers = ["ID", "Nama", "Alamat", "Telepon", "Email"]
-                col_positions = [50, 100, 200, 350, 450]
-                
-                # Header tabel
-                c.setFont("Helvetica-Bold", 10)
-                for i, header in enumerate(headers):
-                    c.drawString(col_positions[i], y, header)
-                
-                y -= 20
-                c.setFont("Helvetica", 9)
-                
-                # Data
-                for row in range(self.pelangganTable.rowCount()):
-                    for col in range(min(5, self.pelangganTable.columnCount())):
-                        item = self.pelangganTable.item(row, col)
-                        text = item.text() if item else ""
-                        # Potong teks jika terlalu panjang
-                        if col == 2 and len(text) > 30:  # Alamat
-                            text = text[:30] + "..."
-                        elif col == 4 and len(text) > 20:  # Email
-                            text = text[:20] + "..."
-                        
-                        c.drawString(col_positions[col], y, text)
-                    
-                    y -= 12
-                    if y < 50:  # Halaman baru
-                        c.showPage()
-                        y = height - 50
-                        c.setFont("Helvetica", 9)
-                
-                c.save()
-                QMessageBox.information(self, "Sukses", f"Daftar pelanggan dicetak: {path}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Gagal mencetak: {str(e)}")
-
-    def cetak_daftar_order_pdf(self):
-        """REPORT 4 CETAK: Cetak Daftar Order ke PDF"""
-        if self.orderTable.rowCount() == 0:
-            QMessageBox.warning(self, "Peringatan", "Tidak ada data order!")
+        self.kirim_struk(int(order_id))
+
+    def kirim_struk(self, order_id, pesan=True):
+        """Kirim struk ke printer thermal di thread pekerja; gagal selalu dilaporkan"""
+        selesai = (lambda tujuan: QMessageBox.information(self, "Sukses", f"Struk dikirim ke {tujuan}")) if pesan else None
+        self.pekerja.jalankan(f'struk_{order_id}', struk.cetak_order, order_id, selesai=selesai,
+                              gagal=self.pesan_gagal(awalan="Gagal mencetak struk: "))
+
+    def cetak_invoice_terpilih(self):
+        """Cetak invoice semua order yang dipilih di tabel order ke satu PDF"""
+        rows = self.orderTable.selectionModel().selectedRows()
+        order_ids = [self.orderModel.id_pada(index.row()) for index in rows]
+        if not order_ids:
+            QMessageBox.warning(self, "Peringatan", "Pilih order di tab Order terlebih dahulu (Ctrl/Shift + klik)!")
             return
-        
-        path, _ = QFileDialog.getSaveFileName(self, "Cetak Daftar Order", 
-                                              "daftar_order.pdf", "PDF Files (*.pdf)")
-        
-        if path:
-            try:
-                c = canvas.Canvas(path, pagesize=letter)
-                width, height = letter
-                
-                # Header
-                c.setFont("Helvetica-Bold", 16)
-                c.drawCentredString(width/2, height - 50, "DAFTAR ORDER LAUNDRY")
-                c.setFont("Helvetica", 10)
-                c.drawCentredString(width/2, height - 70, f"Total: {self.orderTable.rowCount()} order")
-                
-                # Tabel
-                y = height - 100
-                headers = ["ID", "Pelanggan", "Tanggal", "Status", "Biaya", "Layanan"]
-                col_positions = [30, 80, 180, 280, 350, 430]
-                
-                # Header tabel
-                c.setFont("Helvetica-Bold", 9)
-                for i, header in enumerate(headers):
-                    c.drawString(col_positions[i], y, header)
-                
-                y -= 15
-                c.setFont("Helvetica", 8)
-                
-                # Data
-                total_biaya = 0
-                for row in range(self.orderTable.rowCount()):
-                    for col in range(min(6, self.orderTable.columnCount())):
-                        item = self.orderTable.item(row, col)
-                        text = item.text() if item else ""
-                        
-                        # Potong teks jika terlalu panjang
-                        if col == 1 and len(text) > 15:  # Nama pelanggan
-                            text = text[:15] + "..."
-                        elif col == 5 and len(text) > 12:  # Layanan
-                            text = text[:12] + "..."
-                        
-                        c.drawString(col_positions[col], y, text)
-                        
-                        # Hitung total biaya
-                        if col == 4 and "Rp" in text:
-                            try:
-                                angka = float(text.replace("Rp", "").replace(",", "").strip())
-                                total_biaya += angka
-                            except:
-                                pass
-                    
-                    y -= 12
-                    if y < 50:  # Halaman baru
-                        c.showPage()
-                        y = height - 50
-                        c.setFont("Helvetica", 8)
-                
-                # Total biaya
-                c.setFont("Helvetica-Bold", 10)
-                c.drawString(350, y - 20, f"TOTAL BIAYA: Rp {total_biaya:,.0f}")
-                
-                c.save()
-                QMessageBox.information(self, "Sukses", f"Daftar order dicetak: {path}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Gagal mencetak: {str(e)}")
+        self.cetak_invoice_banyak(f"Invoice_{len(order_ids)}_order.pdf", order_ids=order_ids)
 
-    def cetak_daftar_inventory_pdf(self):
-        """REPORT 5 CETAK: Cetak Daftar Inventory ke PDF"""
-        if self.inventoryTable.rowCount() == 0:
-            QMessageBox.warning(self, "Peringatan", "Tidak ada data inventory!")
+    def cetak_invoice_tanggal(self):
+        """Cetak invoice semua order pada satu tanggal ke satu PDF"""
+        tanggal, ok = QInputDialog.getText(self, "Cetak Invoice per Tanggal", "Tanggal (yyyy-mm-dd):",
+                                           text=datetime.now().date().isoformat())
+        if not ok:
             return
-        
-        path, _ = QFileDialog.getSaveFileName(self, "Cetak Daftar Inventory", 
-                                              "daftar_inventory.pdf", "PDF Files (*.pdf)")
-        
-        if path:
-            try:
-                c = canvas.Canvas(path, pagesize=letter)
-                width, height = letter
-                
-                # Header
-                c.setFont("Helvetica-Bold", 16)
-                c.drawCentredString(width/2, height - 50, "DAFTAR INVENTORY LAUNDRY")
-                
-                # Statistik
-                total_nilai = 0
-                total_stok = 0
-                for row in range(self.inventoryTable.rowCount()):
-                    stok_item = self.inventoryTable.item(row, 2)
-                    harga_item = self.inventoryTable.item(row, 3)
-                    if stok_item and harga_item:
-                        try:
-                            stok = int(stok_item.text())
-                            harga_text = harga_item.text().replace("Rp", "").replace(",", "").strip()
-                            harga = float(harga_text) if harga_text else 0
-                            total_nilai += stok * harga
-                            total_stok += stok
-                        except:
-                            pass
-                
-                c.setFont("Helvetica", 10)
-                c.drawCentredString(width/2, height - 70, f"Total Item: {self.inventoryTable.rowCount()}")
-                c.drawCentredString(width/2, height - 85, f"Total Stok: {total_stok} | Total Nilai: Rp {total_nilai:,.0f}")
-                
-                # Tabel
-                y = height - 120
-                headers = ["ID", "Nama Barang", "Stok", "Harga Beli", "Total Nilai"]
-                col_positions = [50, 100, 250, 300, 400]
-                
-                # Header tabel
-                c.setFont("Helvetica-Bold", 10)
-                for i, header in enumerate(headers):
-                    c.drawString(col_positions[i], y, header)
-                
-                y -= 20
-                c.setFont("Helvetica", 9)
-                
-                # Data
-                for row in range(self.inventoryTable.rowCount()):
-                    # ID
-                    id_item = self.inventoryTable.item(row, 0)
-                    c.drawString(col_positions[0], y, id_item.text() if id_item else "")
-                    
-                    # Nama
-                    nama_item = self.inventoryTable.item(row, 1)
-                    nama = nama_item.text() if nama_item else ""
-                    if len(nama) > 20:
-                        nama = nama[:20] + "..."
-                    c.drawString(col_positions[1], y, nama)
-                    
-                    # Stok
-                    stok_item = self.inventoryTable.item(row, 2)
-                    stok = stok_item.text() if stok_item else "0"
-                    c.drawString(col_positions[2], y, stok)
-                    
-                    # Harga
-                    harga_item = self.inventoryTable.item(row, 3)
-                    harga_text = harga_item.text() if harga_item else "Rp 0"
-                    c.drawString(col_positions[3], y, harga_text)
-                    
-                    # Total Nilai
-                    if stok_item and harga_item:
-                        try:
-                            stok_val = int(stok)
-                            harga_val = float(harga_text.replace("Rp", "").replace(",", "").strip())
-                            total = stok_val * harga_val
-                            c.drawString(col_positions[4], y, f"Rp {total:,.0f}")
-                        except:
-                            c.drawString(col_positions[4], y, "Rp 0")
-                    
-                    y -= 15
-                    if y < 50:  # Halaman baru
-                        c.showPage()
-                        y = height - 50
-                        c.setFont("Helvetica", 9)
-                
-                c.save()
-                QMessageBox.information(self, "Sukses", f"Daftar inventory dicetak: {path}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Gagal mencetak: {str(e)}")
-
-    def cetak_laporan_status_order_pdf(self):
-        """REPORT 6 CETAK: Cetak Laporan Status Order ke PDF"""
-        # Pertama generate laporan status
-        self.generate_laporan_status()
-        
-        if self.laporanTable.rowCount() == 0:
-            QMessageBox.warning(self, "Peringatan", "Tidak ada data status order!")
+        try:
+            datetime.strptime(tanggal.strip(), "%Y-%m-%d")
+        except ValueError:
+            QMessageBox.warning(self, "Input Error", "Format tanggal harus yyyy-mm-dd!")
             return
-        
-        path, _ = QFileDialog.getSaveFileName(self, "Cetak Laporan Status Order", 
-                                              "laporan_status_order.pdf", "PDF Files (*.pdf)")
-        
-        if path:
-            try:
-                c = canvas.Canvas(path, pagesize=letter)
-                width, height = letter
-                
-                # Header
-                c.setFont("Helvetica-Bold", 16)
-                c.drawCentredString(width/2, height - 50, "LAPORAN STATUS ORDER LAUNDRY")
-                
-                # Periode
-                tgl_mulai = self.fromDateEdit.date().toString("dd-MM-yyyy")
-                tgl_selesai = self.toDateEdit.date().toString("dd-MM-yyyy")
-                c.setFont("Helvetica", 12)
-                c.drawString(100, height - 80, f"Periode: {tgl_mulai} sampai {tgl_selesai}")
-                
-                # Data tabel
-                y = height - 120
-                c.setFont("Helvetica-Bold", 10)
-                c.drawString(100, y, "Status Order")
-                c.drawString(250, y, "Jumlah Order")
-                c.drawString(350, y, "Total Biaya")
-                
-                y -= 20
-                c.setFont("Helvetica", 10)
-                total_order = 0
-                total_biaya = 0
-                
-                for row in range(self.laporanTable.rowCount()):
-                    status = self.laporanTable.item(row, 0).text() if self.laporanTable.item(row, 0) else ""
-                    jumlah = self.laporanTable.item(row, 1).text() if self.laporanTable.item(row, 1) else "0"
-                    biaya_text = self.laporanTable.item(row, 2).text() if self.laporanTable.item(row, 2) else "Rp 0"
-                    
-                    c.drawString(100, y, status)
-                    c.drawString(250, y, jumlah)
-                    c.drawString(350, y, biaya_text)
-                    
-                    # Hitung total
-                    total_order += int(jumlah) if jumlah.isdigit() else 0
-                    if "Rp" in biaya_text:
-                        try:
-                            angka = float(biaya_text.replace("Rp", "").replace(",", "").strip())
-                            total_biaya += angka
-                        except:
-                            pass
-                    
-                    y -= 15
-                
-                # Total
-                c.setFont("Helvetica-Bold", 12)
-                c.drawString(100, y - 20, f"TOTAL: {total_order} order")
-                c.drawString(250, y - 20, f"Rp {total_biaya:,.0f}")
-                
-                c.save()
-                QMessageBox.information(self, "Sukses", f"Laporan status order dicetak: {path}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Gagal mencetak: {str(e)}")
+        self.cetak_invoice_banyak(f"Invoice_{tanggal.strip()}.pdf", tanggal=tanggal.strip())
 
-    def cetak_dashboard_pdf(self):
-        """REPORT 7 CETAK: Cetak Dashboard/Ringkasan Harian ke PDF"""
-        path, _ = QFileDialog.getSaveFileName(self, "Cetak Dashboard Harian", 
-                                              "dashboard_harian.pdf", "PDF Files (*.pdf)")
+    def cetak_invoice_banyak(self, nama_file, order_ids=None, tanggal=None):
+        """Ambil data semua invoice dalam satu query lalu tulis ke satu PDF, keduanya di thread pekerja"""
+        def siap(daftar):
+            if not daftar:
+                QMessageBox.warning(self, "Peringatan", "Tidak ada order untuk dicetak!")
+                return
+            path, _ = QFileDialog.getSaveFileName(self, "Cetak Invoice", nama_file, "PDF Files (*.pdf)")
+            if path:
+                self.cetak_latar('cetak_invoice', lambda: cetak.tulis_invoice_pdf(path, daftar),
+                                 f"{len(daftar)} invoice dicetak: {path}")
+        
+        self.pekerja.jalankan('cetak_invoice', laporan.invoice, order_ids, tanggal, selesai=siap,
+                              gagal=self.pesan_gagal("Database Error", "Gagal memuat order: "))
+
+    def cetak_laporan_pdf(self, nama):
+        """REPORT 2-6 CETAK: Cetak laporan dari laporan.LAPORAN ke PDF"""
+        definisi = laporan.LAPORAN[nama]
+        if definisi.tampil:
+            # Dataset yang sudah tampil dipakai ulang, selain itu query dulu lalu ditampilkan
+            self.ambil_laporan(nama, lanjut=lambda ds: self.cetak_dataset_pdf(ds, bool(ds.baris)))
+        else:
+            # Daftar bisa sangat panjang: cukup dicek ada isinya, barisnya dibaca dari
+            # cursor per potongan sambil PDF ditulis
+            args = self.parameter_laporan(definisi)
+            self.pekerja.jalankan(f'cetak_{nama}', laporan.ada_data, nama, *args,
+                                  selesai=lambda ada: self.cetak_dataset_pdf(laporan.buka(nama, *args), ada),
+                                  gagal=self.pesan_gagal("Database Error", "Gagal memuat laporan: "))
+
+    def cetak_dataset_pdf(self, ds, ada_data=True):
+        """Simpan dataset laporan ke PDF di thread pekerja"""
+        judul = ds.judul.title()
+        if not ada_data:
+            QMessageBox.warning(self, "Peringatan", f"Tidak ada data untuk {judul}!")
+            return
         
+        path, _ = QFileDialog.getSaveFileName(self, f"Cetak {judul}", ds.laporan.nama_file, "PDF Files (*.pdf)")
         if path:
-            try:
-                c = canvas.Canvas(path, pagesize=letter)
-                width, height = letter
-                
-                # Header
-                c.setFont("Helvetica-Bold", 18)
-                c.drawCentredString(width/2, height - 50, "DASHBOARD HARIAN LAUNDRY")
-                
-                # Tanggal
-                today = datetime.now().strftime("%d-%m-%Y")
-                c.setFont("Helvetica", 12)
-                c.drawCentredString(width/2, height - 80, f"Tanggal: {today}")
-                
-                # Statistik
-                y = height - 120
-                c.setFont("Helvetica-Bold", 14)
-                c.drawString(100, y, "STATISTIK HARIAN")
-                
-                y -= 30
-                c.setFont("Helvetica", 11)
-                
-                # Ambil data dari database
-                conn = sqlite3.connect('laundry.db')
-                cursor = conn.cursor()
-                
-                # Total order hari ini
-                cursor.execute("SELECT COUNT(id) FROM orders WHERE tanggal=?", (datetime.now().date().isoformat(),))
-                total_order = cursor.fetchone()[0] or 0
-                
-                # Order per status
-                cursor.execute("SELECT status, COUNT(id) FROM orders WHERE tanggal=? GROUP BY status", 
-                              (datetime.now().date().isoformat(),))
-                status_data = cursor.fetchall()
-                
-                # Total pendapatan
-                cursor.execute("SELECT SUM(biaya) FROM orders WHERE tanggal=?", (datetime.now().date().isoformat(),))
-                total_pendapatan = cursor.fetchone()[0] or 0
-                
-                # Pelanggan baru hari ini
-                cursor.execute("""
-                    SELECT COUNT(DISTINCT p.id) 
-                    FROM pelanggan p 
-                    JOIN orders o ON p.id = o.pelanggan_id 
-                    WHERE o.tanggal=?
-                """, (datetime.now().date().isoformat(),))
-                pelanggan_hari_ini = cursor.fetchone()[0] or 0
-                
-                conn.close()
-                
-                # Tampilkan statistik
-                stats = [
-                    ["Total Order Hari Ini", str(total_order)],
-                    ["Total Pendapatan", f"Rp {total_pendapatan:,.0f}"],
-                    ["Pelanggan Dilayani", str(pelanggan_hari_ini)],
-                ]
-                
-                for label, value in stats:
-                    c.drawString(100, y, f"{label}: {value}")
-                    y -= 25
-                
-                # Status order
-                y -= 10
-                c.setFont("Helvetica-Bold", 12)
-                c.drawString(100, y, "STATUS ORDER:")
-                y -= 25
-                c.setFont("Helvetica", 11)
-                
-                for status, jumlah in status_data:
-                    c.drawString(120, y, f"• {status}: {jumlah} order")
-                    y -= 20
-                
-                # Footer
-                c.setFont("Helvetica-Oblique", 10)
-                c.drawCentredString(width/2, y - 30, "Laporan otomatis dihasilkan oleh Aplikasi Laundry")
-                
-                c.save()
-                QMessageBox.information(self, "Sukses", f"Dashboard dicetak: {path}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Gagal mencetak: {str(e)}")
+            self.cetak_latar(f'cetak_{ds.laporan.nama}', lambda: cetak.tulis_pdf(path, ds), f"{judul} dicetak: {path}")
 
     # --- FUNGSI TAMBAHAN ---
     
     def cetak_semua_laporan(self):
-        """Cetak semua 7 report sekaligus"""
-        reply = QMessageBox.question(self, "Cetak Semua Laporan", 
-                                     "Yakin ingin mencetak semua 7 laporan?",
-                                     QMessageBox.Yes | QMessageBox.No)
-        if reply == QMessageBox.Yes:
-            # Cetak satu per satu
-            self.cetak_dashboard_pdf()
-            self.cetak_daftar_pelanggan_pdf()
-            self.cetak_daftar_order_pdf()
-            self.cetak_daftar_inventory_pdf()
-            self.cetak_laporan_pendapatan_pdf()
-            self.cetak_laporan_status_order_pdf()
-            QMessageBox.information(self, "Selesai", "Semua laporan telah dicetak!")
+        """Cetak semua laporan di laporan.LAPORAN ke satu folder, paralel di beberapa proses"""
+        folder = QFileDialog.getExistingDirectory(self, "Cetak Semua Laporan ke Folder")
+        if not folder:
+            return
+        
+        tugas = [(folder, nama, *self.parameter_laporan(definisi)) for nama, definisi in laporan.LAPORAN.items()]
+        judul = lambda args: laporan.LAPORAN[args[1]].judul.title()
+        
+        kemajuan = QProgressDialog("Mencetak semua laporan...", "Batal", 0, len(tugas), self)
+        kemajuan.setWindowTitle("Cetak Semua Laporan")
+        kemajuan.setWindowModality(Qt.WindowModal)
+        kemajuan.setMinimumDuration(0)
+        kemajuan.setValue(0)
+        
+        def batal():
+            self.proses.batalkan()
+            self.statusbar.showMessage("Cetak semua laporan dibatalkan")
+        
+        def satu_selesai(args, hasil):
+            kemajuan.setLabelText(f"{judul(args)} selesai")
+            kemajuan.setValue(kemajuan.value() + 1)
+        
+        def selesai(hasil):
+            # Dialog kemajuan tertutup sendiri saat nilainya mencapai jumlah tugas
+            dicetak = [h for h in hasil if isinstance(h, str)]
+            kosong = [judul(args) for args, h in zip(tugas, hasil) if h is None]
+            gagal = [f"{judul(args)}: {h}" for args, h in zip(tugas, hasil) if isinstance(h, Exception)]
+            pesan = f"{len(dicetak)} laporan dicetak ke {folder}"
+            if kosong:
+                pesan += "\nTidak ada data: " + ", ".join(kosong)
+            if gagal:
+                pesan += "\nGagal: " + "; ".join(gagal)
+            (QMessageBox.warning if gagal else QMessageBox.information)(self, "Cetak Semua Laporan", pesan)
+        
+        kemajuan.canceled.connect(batal)
+        self.proses.petakan(cetak.cetak_ke_folder, tugas, satu_selesai, selesai)
 
     def ekspor_laporan_csv(self):
-        """Ekspor laporan ke CSV"""
-        if self.laporanTable.rowCount() == 0:
+        """Ekspor laporan yang sedang tampil ke CSV"""
+        if self.laporan_data is None or not self.laporan_data.baris:
             QMessageBox.warning(self, "Peringatan", "Generate laporan terlebih dahulu!")
             return
 
@@ -1247,26 +914,24 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         
         if path:
             try:
-                with open(path, mode='w', newline='', encoding='utf-8') as file:
-                    writer = csv.writer(file)
-                    # Tulis Header
-                    headers = []
-                    for col in range(self.laporanTable.columnCount()):
-                        headers.append(self.laporanTable.horizontalHeaderItem(col).text())
-                    writer.writerow(headers)
-                    
-                    # Tulis Data
-                    for row in range(self.laporanTable.rowCount()):
-                        row_data = []
-                        for col in range(self.laporanTable.columnCount()):
-                            item = self.laporanTable.item(row, col)
-                            row_data.append(item.text() if item else "")
-                        writer.writerow(row_data)
-                        
+                cetak.tulis_csv(path, self.laporan_data)
                 QMessageBox.information(self, "Sukses", f"Laporan berhasil diekspor ke {path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Gagal mengekspor data: {str(e)}")
 
+    def ekspor_csv(self, nama):
+        """Ekspor laporan `nama` ke CSV di thread pekerja; baris dibaca dari cursor per potongan"""
+        definisi = laporan.LAPORAN[nama]
+        nama_file = os.path.splitext(definisi.nama_file)[0] + ".csv"
+        path, _ = QFileDialog.getSaveFileName(self, f"Ekspor {definisi.judul.title()}", nama_file, "CSV Files (*.csv)")
+        if not path:
+            return
+        ds = laporan.buka(nama, *self.parameter_laporan(definisi))
+        self.pekerja.jalankan(f'csv_{nama}', cetak.tulis_csv, path, ds,
+                              selesai=lambda jumlah: QMessageBox.information(
+                                  self, "Sukses", f"{jumlah} baris diekspor ke {path}"),
+                              gagal=self.pesan_gagal(awalan="Gagal mengekspor data: "))
+
     def ubah_password(self):
         password_lama = self.passwordLamaLineEdit.text()
         password_baru = self.passwordBaruLineEdit.text()
@@ -1281,24 +946,21 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             return
             
         try:
-            conn = sqlite3.connect('laundry.db')
-            c = conn.cursor()
             # Cek password lama
-            c.execute("SELECT * FROM users WHERE username='admin' AND password=?", (password_lama,))
-            user = c.fetchone()
+            with database.cursor() as c:
+                c.execute("SELECT * FROM users WHERE username='admin' AND password=?", (password_lama,))
+                user = c.fetchone()
             
             if user:
                 # Update password
-                c.execute("UPDATE users SET password=? WHERE username='admin'", (password_baru,))
-                conn.commit()
+                with database.transaksi() as c:
+                    c.execute("UPDATE users SET password=? WHERE username='admin'", (password_baru,))
                 QMessageBox.information(self, "Sukses", "Password berhasil diubah")
                 self.passwordLamaLineEdit.clear()
                 self.passwordBaruLineEdit.clear()
                 self.konfirmasiLineEdit.clear()
             else:
                 QMessageBox.warning(self, "Error", "Password lama salah")
-                
-            conn.close()
         except sqlite3.Error as e:
             QMessageBox.critical(self, "Error", str(e))
 
@@ -1306,17 +968,22 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         file_name, _ = QFileDialog.getSaveFileName(self, "Backup Database", "backup_laundry.db", "DB Files (*.db)")
         if file_name:
             try:
-                shutil.copy('laundry.db', file_name)
+                database.backup(file_name)
                 QMessageBox.information(self, "Sukses", f"Database berhasil dibackup ke {file_name}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Gagal backup database: {str(e)}")
 
 # --- MAIN PROGRAM ---
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # proses cetak di build PyInstaller
     app = QApplication(sys.argv)
     init_db()
     login = LoginDialog()
     if login.exec_() == QDialog.Accepted:
         window = MainWindow()
         window.show()
+        app.aboutToQuit.connect(bus.berhenti)
+        app.aboutToQuit.connect(window.pekerja.hentikan)
+        app.aboutToQuit.connect(window.proses.hentikan)
+        app.aboutToQuit.connect(database.tutup_semua)
         sys.exit(app.exec_())
\ No newline at end of file
@@ -87,9 +87,6 @@ class Ui_OrderDialog(object):
         self.formLayout.setWidget(1, QtWidgets.QFormLayout.LabelRole, self.label_layanan)
         self.layananComboBox = QtWidgets.QComboBox(self.groupBox_order)
         self.layananComboBox.setObjectName("layananComboBox")
-        self.layananComboBox.addItem("")
-        self.layananComboBox.addItem("")
-        self.layananComboBox.addItem("")
         self.formLayout.setWidget(1, QtWidgets.QFormLayout.FieldRole, self.layananComboBox)
         self.label_berat = QtWidgets.QLabel(self.groupBox_order)
         self.label_berat.setObjectName("label_berat")
@@ -134,9 +131,6 @@ class Ui_OrderDialog(object):
         self.groupBox_order.setTitle(_translate("OrderDialog", "Detail Order"))
         self.label_pelanggan.setText(_translate("OrderDialog", "Pelanggan:"))
         self.label_layanan.setText(_translate("OrderDialog", "Layanan:"))
-        self.layananComboBox.setItemText(0, _translate("OrderDialog", "Cuci Kering"))
-        self.layananComboBox.setItemText(1, _translate("OrderDialog", "Setrika"))
-        self.layananComboBox.setItemText(2, _translate("OrderDialog", "Cuci Basah"))
         self.label_berat.setText(_translate("OrderDialog", "Berat/Jumlah (kg/item):"))
         self.label_total_biaya.setText(_translate("OrderDialog", "Total Biaya:"))
         self.totalBiayaLineEdit.setText(_translate("OrderDialog", "Rp 0"))
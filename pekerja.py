@@ -0,0 +1,200 @@
+# pekerja.py
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Jumlah thread pekerja; setiap thread memakai koneksi SQLite sendiri (database.get_connection)
+MAKS_THREAD = 4
+
+_local = threading.local()
+
+
+class Dibatalkan(Exception):
+    """Tugas dihentikan karena sudah digantikan permintaan yang lebih baru"""
+
+
+def cek_batal():
+    """Dipanggil tugas panjang (misalnya loop PDF) untuk berhenti lebih awal jika dibatalkan"""
+    tugas = getattr(_local, 'tugas', None)
+    if tugas is not None and tugas.dibatalkan:
+        raise Dibatalkan()
+
+
+class _Sinyal(QObject):
+    selesai = pyqtSignal(object)
+    gagal = pyqtSignal(object)
+
+
+class _Tugas(QRunnable):
+    def __init__(self, kunci, fungsi, args, kwargs):
+        super().__init__()
+        # Dihapus manual oleh Pelaksana setelah hasilnya diterima di thread GUI
+        self.setAutoDelete(False)
+        self.kunci = kunci
+        self.fungsi = fungsi
+        self.args = args
+        self.kwargs = kwargs
+        self.dibatalkan = False
+        self.sinyal = _Sinyal()
+
+    def run(self):
+        _local.tugas = self
+        try:
+            cek_batal()
+            hasil = self.fungsi(*self.args, **self.kwargs)
+        except Exception as e:
+            self.sinyal.gagal.emit(e)
+        else:
+            self.sinyal.selesai.emit(hasil)
+        finally:
+            _local.tugas = None
+
+
+class Pelaksana(QObject):
+    """Menjalankan query dan pembuatan laporan di QThreadPool, di luar thread GUI.
+
+    Setiap tugas punya kunci (biasanya nama tab). Tugas baru dengan kunci yang
+    sama membatalkan tugas lama: yang belum mulai dibuang dari antrian, yang
+    sedang berjalan dibiarkan selesai tetapi hasilnya tidak dipakai. Callback
+    selesai/gagal selalu dipanggil di thread GUI.
+    """
+
+    def __init__(self, parent=None, maks_thread=MAKS_THREAD):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(maks_thread)
+        self.pool.setExpiryTimeout(-1)  # thread tidak dibuang agar koneksinya tetap terpakai
+        self._aktif = {}       # kunci -> tugas terbaru
+        self._berjalan = set()  # referensi tugas sampai sinyalnya diterima
+
+    def jalankan(self, kunci, fungsi, *args, selesai=None, gagal=None, **kwargs):
+        """Jalankan fungsi(*args, **kwargs) di thread pekerja, batalkan tugas lama dengan kunci sama"""
+        self.batalkan(kunci)
+        tugas = _Tugas(kunci, fungsi, args, kwargs)
+        tugas.sinyal.selesai.connect(lambda hasil: self._terima(tugas, selesai, hasil))
+        tugas.sinyal.gagal.connect(lambda e: self._terima(tugas, gagal, e))
+        self._aktif[kunci] = tugas
+        self._berjalan.add(tugas)
+        self.pool.start(tugas)
+        return tugas
+
+    def _terima(self, tugas, callback, hasil):
+        self._berjalan.discard(tugas)
+        if self._aktif.get(tugas.kunci) is not tugas:
+            return  # sudah digantikan permintaan baru
+        del self._aktif[tugas.kunci]
+        if isinstance(hasil, Dibatalkan) or callback is None:
+            return
+        callback(hasil)
+
+    def batalkan(self, kunci):
+        tugas = self._aktif.pop(kunci, None)
+        if tugas is None:
+            return
+        tugas.dibatalkan = True
+        if self.pool.tryTake(tugas):
+            self._berjalan.discard(tugas)
+
+    def hentikan(self):
+        """Batalkan semua tugas dan tunggu yang sedang berjalan (saat aplikasi keluar)"""
+        for kunci in list(self._aktif):
+            self.batalkan(kunci)
+        self.pool.waitForDone()
+
+
+class PelaksanaProses(QObject):
+    """Menjalankan pekerjaan CPU-bound (menulis PDF dengan reportlab) di beberapa proses.
+
+    Thread pekerja tidak membantu untuk pekerjaan Python murni karena GIL; di sini
+    setiap proses punya interpreter dan koneksi SQLite sendiri. Proses dibuat
+    dengan 'spawn' karena fork dari aplikasi Qt yang punya banyak thread tidak aman,
+    dan dipakai ulang antar batch. Fungsi dan argumennya harus bisa di-pickle.
+    """
+    _hasil = pyqtSignal(object, int, object)  # batch, indeks pekerjaan, hasil atau Exception
+
+    def __init__(self, parent=None, maks_proses=None, initializer=None, initargs=()):
+        super().__init__(parent)
+        self.maks_proses = maks_proses or os.cpu_count() or 1
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor = None
+        self._batch = None
+        self._hasil.connect(self._terima)
+
+    def petakan(self, fungsi, daftar_args, satu_selesai=None, selesai=None):
+        """Jalankan fungsi(*args) untuk setiap args secara paralel, batch lama dibatalkan.
+
+        satu_selesai(args, hasil) dipanggil di thread GUI setiap satu pekerjaan
+        selesai, selesai(daftar hasil) setelah semuanya; hasil yang gagal berupa Exception.
+        """
+        self.batalkan()
+        batch = self._batch = _Batch(daftar_args, satu_selesai, selesai)
+        for indeks, args in enumerate(batch.daftar_args):
+            future = self._kirim(fungsi, args)
+            batch.futures.append(future)
+            # Callback future berjalan di thread executor; sinyal membawanya ke thread GUI
+            future.add_done_callback(lambda f, i=indeks: self._hasil.emit(batch, i, _hasil_future(f)))
+        if not batch.daftar_args and selesai:
+            self._batch = None
+            selesai([])
+
+    def _kirim(self, fungsi, args):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.maks_proses, multiprocessing.get_context('spawn'),
+                                                 self.initializer, self.initargs)
+        try:
+            return self._executor.submit(fungsi, *args)
+        except BrokenProcessPool:
+            # Salah satu proses mati (misalnya kehabisan memori); buat pool baru
+            self._executor = None
+            return self._kirim(fungsi, args)
+
+    def _terima(self, batch, indeks, hasil):
+        if batch is not self._batch:
+            return  # sudah dibatalkan
+        batch.hasil[indeks] = hasil
+        batch.sisa -= 1
+        # Dicatat sebelum callback: callback bisa memproses event (dialog modal) dan
+        # menerima hasil berikutnya lebih dulu
+        terakhir = batch.sisa == 0
+        if terakhir:
+            self._batch = None
+        if batch.satu_selesai:
+            batch.satu_selesai(batch.daftar_args[indeks], hasil)
+        if terakhir and batch.selesai:
+            batch.selesai(batch.hasil)
+
+    def batalkan(self):
+        """Buang pekerjaan yang belum mulai; yang sedang berjalan selesai tanpa callback"""
+        batch, self._batch = self._batch, None
+        if batch is not None:
+            for future in batch.futures:
+                future.cancel()
+
+    def hentikan(self):
+        """Batalkan batch dan matikan proses (saat aplikasi keluar)"""
+        self.batalkan()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+class _Batch:
+    def __init__(self, daftar_args, satu_selesai, selesai):
+        self.daftar_args = list(daftar_args)
+        self.satu_selesai = satu_selesai
+        self.selesai = selesai
+        self.futures = []
+        self.hasil = [None] * len(self.daftar_args)
+        self.sisa = len(self.daftar_args)
+
+
+def _hasil_future(future):
+    if future.cancelled():
+        return Dibatalkan()
+    error = future.exception()
+    return error if error is not None else future.result()
@@ -0,0 +1,55 @@
+# perubahan.py
+import sqlite3
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+import database
+
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+
+# Seberapa sering memeriksa perubahan dari kasir lain (ms)
+INTERVAL_PANTAU = 2000
+
+
+class BusPerubahan(QObject):
+    """Notifikasi perubahan data di aplikasi.
+
+    Setiap penulisan mengirim (tabel, id baris, operasi) setelah commit sehingga
+    tampilan cukup memperbarui baris yang terkena. Perubahan dari proses lain
+    (kasir lain di database yang sama) dideteksi lewat PRAGMA data_version,
+    yang hanya berubah jika koneksi lain melakukan commit.
+    """
+    berubah = pyqtSignal(str, object, str, object)  # tabel, id baris, operasi, rekaman atau None
+    berubah_luar = pyqtSignal()              # diubah proses lain, baris tidak diketahui
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._versi = None
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.cek_luar)
+
+    def kirim(self, tabel, row_id, operasi=UPDATE, rekaman=None):
+        """Kirim perubahan; rekaman {kolom: nilai} yang disimpan agar tampilan tidak perlu query ulang"""
+        self.berubah.emit(tabel, row_id, operasi, rekaman)
+
+    def pantau(self, interval=INTERVAL_PANTAU):
+        """Mulai polling data_version (di thread GUI, memakai koneksi thread GUI)"""
+        self._versi = database.data_version()
+        self._timer.start(interval)
+
+    def berhenti(self):
+        self._timer.stop()
+
+    def cek_luar(self):
+        try:
+            versi = database.data_version()
+        except sqlite3.Error:
+            return
+        if versi != self._versi:
+            self._versi = versi
+            self.berubah_luar.emit()
+
+
+bus = BusPerubahan()
@@ -0,0 +1,131 @@
+# struk.py
+import os
+from datetime import datetime
+from functools import lru_cache
+
+import laporan
+from uang import Rupiah
+
+# Struk pembayaran langsung ke printer thermal dalam perintah ESC/POS, tanpa PDF dan dialog print.
+#
+# LAUNDRY_PRINTER berisi file device printer (misalnya /dev/usb/lp0, atau nama share printer
+# di Windows) atau folder spool; di folder, setiap struk ditulis sebagai file .bin baru.
+# LAUNDRY_PRINTER_LEBAR adalah lebar kertas dalam mm: 58 (32 karakter) atau 80 (48 karakter).
+PRINTER = os.environ.get('LAUNDRY_PRINTER', '')
+LEBAR_KERTAS = int(os.environ.get('LAUNDRY_PRINTER_LEBAR', 58))
+KARAKTER_PER_BARIS = {58: 32, 80: 48}
+
+ESC, GS = b'\x1b', b'\x1d'
+INIT = ESC + b'@'
+KIRI, TENGAH = ESC + b'a\x00', ESC + b'a\x01'
+TEBAL, BIASA = ESC + b'E\x01', ESC + b'E\x00'
+BESAR, NORMAL = GS + b'!\x11', GS + b'!\x00'  # lebar dan tinggi 2x
+POTONG = GS + b'V\x42\x03'                   # maju 3 baris lalu potong sebagian
+KODE_HALAMAN = 'cp437'                       # code page bawaan hampir semua printer ESC/POS
+
+
+def _baris(teks):
+    return teks.encode(KODE_HALAMAN, 'replace') + b'\n'
+
+
+def _teks(nilai):
+    return '' if nilai is None else str(nilai)
+
+
+def _kiri_kanan(kiri, kanan, lebar):
+    """`kiri` rata kiri dan `kanan` rata kanan dalam satu baris; NULL dicetak kosong.
+
+    Jika tidak muat, `kiri` dicetak sendiri lalu `kanan` di baris berikutnya (dipecah per
+    `lebar` karakter), jadi tidak ada baris yang lebih lebar dari kertas.
+    """
+    kiri, kanan = _teks(kiri)[:lebar], _teks(kanan)
+    if len(kiri) + (1 if kiri else 0) + len(kanan) <= lebar:
+        return _baris(kiri + kanan.rjust(lebar - len(kiri)))
+    hasil = _baris(kiri) if kiri else b''
+    for i in range(0, len(kanan), lebar):
+        hasil += _baris(kanan[i:i + lebar].rjust(lebar))
+    return hasil
+
+
+@lru_cache(maxsize=None)
+def _template(lebar):
+    """Bagian struk yang sama untuk semua order: (kepala, garis, kaki), dibuat sekali per lebar kertas"""
+    garis = _baris('-' * lebar)
+    kepala = b''.join([
+        INIT, TENGAH,
+        TEBAL, BESAR, _baris("LAUNDRY EXPRESS"), NORMAL, BIASA,
+        _baris("Jl. Contoh No. 123, Kota Anda"),
+        _baris("Telp: (021) 1234567"),
+        garis,
+        TEBAL, _baris("STRUK PEMBAYARAN"), BIASA,
+        KIRI,
+    ])
+    kaki = b''.join([
+        garis, TENGAH,
+        _baris("Terima kasih atas"),
+        _baris("kepercayaan Anda!"),
+        _baris("Struk ini sebagai bukti"),
+        _baris("pembayaran yang sah"),
+        POTONG,
+    ])
+    return kepala, garis, kaki
+
+
+def buat_struk(inv, bayar=None, kembalian=None, lebar=None):
+    """Byte ESC/POS struk untuk satu laporan.Invoice; bayar/kembalian dicetak jika ada"""
+    lebar = lebar or KARAKTER_PER_BARIS.get(LEBAR_KERTAS, 32)
+    kepala, garis, kaki = _template(lebar)
+    isi = [
+        kepala,
+        _kiri_kanan("No.", f"LAUNDRY-{inv.id}", lebar),
+        _kiri_kanan("Tanggal", inv.tanggal, lebar),
+        _kiri_kanan("Status", inv.status, lebar),
+    ]
+    if inv.selesai:
+        isi.append(_kiri_kanan("Est. Selesai", f"{inv.selesai:%Y-%m-%d}", lebar))
+    isi += [
+        _kiri_kanan("Nama", inv.nama, lebar),
+        _kiri_kanan("Telepon", inv.telepon, lebar),
+        garis,
+        _kiri_kanan(f"{_teks(inv.layanan)} {'' if inv.berat is None else f'{inv.berat} kg'}".strip(),
+                    str(inv.biaya), lebar),
+        garis,
+        TEBAL, _kiri_kanan("TOTAL", str(inv.biaya), lebar), BIASA,
+    ]
+    if bayar is not None:
+        isi.append(_kiri_kanan("Bayar", str(Rupiah(bayar)), lebar))
+    if kembalian is not None:
+        isi.append(_kiri_kanan("Kembalian", str(Rupiah(kembalian)), lebar))
+    isi.append(kaki)
+    return b''.join(isi)
+
+
+def kirim(data, tujuan=None):
+    """Kirim byte ke printer (file device) atau folder spool; kembalikan path yang ditulis"""
+    tujuan = tujuan or PRINTER
+    if not tujuan:
+        raise RuntimeError("Printer struk belum diatur (environment variable LAUNDRY_PRINTER)")
+    if os.path.isdir(tujuan):
+        nama = f"struk_{datetime.now():%Y%m%d_%H%M%S_%f}.bin"
+        path = os.path.join(tujuan, nama)
+        # Ditulis dengan nama sementara agar pengambil spool tidak membaca file setengah jadi
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+        return path
+    with open(tujuan, 'ab') as f:
+        f.write(data)
+    return tujuan
+
+
+def cetak_struk(inv, bayar=None, kembalian=None, tujuan=None):
+    """Buat lalu kirim struk satu order ke printer thermal"""
+    return kirim(buat_struk(inv, bayar, kembalian), tujuan)
+
+
+def cetak_order(order_id, tujuan=None):
+    """Cetak struk order dari database, dengan pembayaran terakhirnya jika sudah dibayar"""
+    daftar = laporan.invoice([order_id])
+    if not daftar:
+        raise LookupError(f"ID Order {order_id} tidak ditemukan!")
+    return cetak_struk(daftar[0], *(laporan.pembayaran_terakhir(order_id) or ()), tujuan=tujuan)
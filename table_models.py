@@ -0,0 +1,307 @@
+# table_models.py
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+import database
+from perubahan import DELETE
+from uang import Rupiah
+
+
+def _nilai_urut(nilai):
+    """Kunci Python yang mengikuti urutan ORDER BY SQLite: NULL < angka < teks < blob"""
+    if nilai is None:
+        return (0, 0)
+    if isinstance(nilai, (int, float)):
+        return (1, nilai)
+    if isinstance(nilai, str):
+        return (2, nilai)
+    return (3, bytes(nilai))
+
+
+def _segmen_keyset(expr, id_expr, setelah, turun):
+    """Daftar (kondisi WHERE, params) untuk baris setelah `setelah` = (nilai, id) atau None.
+
+    Row value (expr, id) < (?, ?) memakai index untuk seek langsung ke posisi
+    terakhir. NULL (terkecil di SQLite) tidak bisa dibandingkan, jadi baris
+    NULL diambil sebagai segmen terpisah: di akhir untuk DESC, di awal untuk ASC.
+    """
+    op = '<' if turun else '>'
+    null = (f"{expr} IS NULL", [])
+    bukan_null = (f"{expr} IS NOT NULL", [])
+    if setelah is None:
+        return [bukan_null, null] if turun else [null, bukan_null]
+    nilai, last_id = setelah
+    if nilai is None:
+        sisa_null = (f"{expr} IS NULL AND {id_expr} {op} ?", [last_id])
+        return [sisa_null] if turun else [sisa_null, bukan_null]
+    lanjut = (f"({expr}, {id_expr}) {op} (?, ?)", [nilai, last_id])
+    return [lanjut, null] if turun else [lanjut]
+
+
+class LazyTableModel(QAbstractTableModel):
+    """Model tabel yang mengambil baris dari SQLite per halaman (keyset pagination).
+
+    Hanya halaman yang sudah discroll yang dimuat; QTableView memanggil
+    canFetchMore/fetchMore saat pengguna mendekati baris terakhir.
+    """
+    KOLOM = []          # judul kolom
+    KOLOM_SQL = []      # ekspresi SQL per kolom, kolom pertama harus id
+    FROM = ""           # FROM ... JOIN ...
+    KOLOM_CARI = []     # ekspresi yang dicocokkan dengan teks pencarian
+    KOLOM_REKAMAN = None  # kunci rekaman dialog per kolom, default nama kolom di KOLOM_SQL
+    TIPE_KOLOM = {}     # indeks kolom -> tipe tampilan (Rupiah), sama untuk baris dari SQL dan dari rekaman
+    UKURAN_HALAMAN = 200
+
+    def __init__(self, urut_kolom=0, turun=False, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._habis = True
+        self._dimuat = False
+        self.urut_kolom = urut_kolom
+        self.turun = turun
+        self.teks_cari = ""
+        # Jika diisi, muat_ulang() diserahkan ke pemuat(model), misalnya thread pekerja
+        self.pemuat = None
+
+    # --- Query ---
+    def _kondisi_cari(self):
+        """Filter pencarian (substring, tidak peka huruf besar) atau None"""
+        if not self.teks_cari or not self.KOLOM_CARI:
+            return None, []
+        pola = f"%{self.teks_cari}%"
+        kondisi = " OR ".join(f"{expr} LIKE ?" for expr in self.KOLOM_CARI)
+        return f"({kondisi})", [pola] * len(self.KOLOM_CARI)
+
+    def _query_halaman(self, c, setelah=None, limit=None):
+        limit = limit or self.UKURAN_HALAMAN
+        filter_sql, filter_params = self._kondisi_cari()
+        expr = self.KOLOM_SQL[self.urut_kolom]
+        id_expr = self.KOLOM_SQL[0]
+        arah = "DESC" if self.turun else "ASC"
+        if setelah is not None:
+            setelah = (setelah[self.urut_kolom], setelah[0])
+        rows = []
+        for kondisi, params in _segmen_keyset(expr, id_expr, setelah, self.turun):
+            if filter_sql:
+                kondisi, params = f"{kondisi} AND {filter_sql}", params + filter_params
+            c.execute(f"SELECT {', '.join(self.KOLOM_SQL)} {self.FROM} WHERE {kondisi} "
+                      f"ORDER BY {expr} {arah}, {id_expr} {arah} LIMIT ?",
+                      params + [limit - len(rows)])
+            rows += c.fetchall()
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def halaman_awal(self):
+        """Query halaman pertama tanpa menyentuh model (aman di thread pekerja)"""
+        with database.cursor() as c:
+            return self._query_halaman(c)
+
+    def pasang_halaman_awal(self, rows):
+        """Ganti semua baris dengan hasil halaman_awal()"""
+        self.beginResetModel()
+        self._rows = rows
+        self._habis = len(rows) < self.UKURAN_HALAMAN
+        self._dimuat = True
+        self.endResetModel()
+
+    def muat_ulang(self):
+        """Buang semua baris lalu ambil halaman pertama"""
+        if self.pemuat is not None:
+            self.pemuat(self)
+        else:
+            self.pasang_halaman_awal(self.halaman_awal())
+
+    def cari(self, teks):
+        """Filter baris di database; tabel dimuat ulang dari halaman pertama"""
+        teks = teks.strip()
+        if teks != self.teks_cari:
+            self.teks_cari = teks
+            self.muat_ulang()
+
+    def id_pada(self, row):
+        return self._rows[row][0] if 0 <= row < len(self._rows) else None
+
+    def baris_id(self, row_id):
+        """Indeks baris dengan id ini di halaman yang sudah dimuat, atau None"""
+        for i, baris in enumerate(self._rows):
+            if baris[0] == row_id:
+                return i
+        return None
+
+    # --- Perubahan per baris ---
+    def _kunci_urut(self, baris):
+        return _nilai_urut(baris[self.urut_kolom]), baris[0]
+
+    def _posisi(self, baris, kecuali=None):
+        """Indeks sisip baris menurut urutan aktif, None jika jatuh setelah halaman yang dimuat"""
+        rows = self._rows if kecuali is None else self._rows[:kecuali] + self._rows[kecuali + 1:]
+        kunci = self._kunci_urut(baris)
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            k = self._kunci_urut(rows[mid])
+            if (k > kunci) if self.turun else (k < kunci):
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(rows) and not self._habis:
+            return None  # akan terambil oleh fetchMore
+        return lo
+
+    def ambil_baris(self, row_id):
+        """Satu baris berdasarkan id (dengan filter pencarian aktif), None jika tidak ada"""
+        filter_sql, params = self._kondisi_cari()
+        kondisi = f"{self.KOLOM_SQL[0]} = ?" + (f" AND {filter_sql}" if filter_sql else "")
+        with database.cursor() as c:
+            c.execute(f"SELECT {', '.join(self.KOLOM_SQL)} {self.FROM} WHERE {kondisi}", [row_id] + params)
+            return c.fetchone()
+
+    def terapkan_baris(self, row_id, baris):
+        """Pasang versi baru satu baris di posisi urutnya; baris None berarti dihapus.
+
+        Baris yang posisinya tetap hanya memicu dataChanged, yang pindah memakai
+        beginMoveRows, sehingga scroll dan seleksi di view tidak hilang.
+        """
+        if not self._dimuat:
+            return  # belum pernah dimuat, baris ikut terambil saat muat_ulang()
+        lama = self.baris_id(row_id)
+        baru = None if baris is None else self._posisi(baris, kecuali=lama)
+        if lama is not None and baru is not None:
+            if baru != lama:
+                tujuan = baru if baru < lama else baru + 1
+                self.beginMoveRows(QModelIndex(), lama, lama, QModelIndex(), tujuan)
+                del self._rows[lama]
+                self._rows.insert(baru, baris)
+                self.endMoveRows()
+            else:
+                self._rows[lama] = baris
+            self.dataChanged.emit(self.index(baru, 0), self.index(baru, self.columnCount() - 1))
+        elif lama is not None:
+            self.beginRemoveRows(QModelIndex(), lama, lama)
+            del self._rows[lama]
+            self.endRemoveRows()
+        elif baru is not None:
+            self.beginInsertRows(QModelIndex(), baru, baru)
+            self._rows.insert(baru, baris)
+            self.endInsertRows()
+
+    def perbarui_baris(self, row_id):
+        """Ambil ulang satu baris dari database dan terapkan di model"""
+        self.terapkan_baris(row_id, self.ambil_baris(row_id))
+
+    def baris_dari_rekaman(self, row_id, rekaman):
+        """Susun baris dari rekaman yang baru disimpan {kolom: nilai}.
+
+        Kolom yang tidak ada di rekaman diambil dari baris lama di model;
+        None jika baris lama juga tidak ada.
+        """
+        kunci = self.KOLOM_REKAMAN or [expr.split('.')[-1] for expr in self.KOLOM_SQL]
+        lama = self.baris_id(row_id)
+        baris = []
+        for i, kolom in enumerate(kunci):
+            if kolom in rekaman:
+                baris.append(rekaman[kolom])
+            elif lama is not None:
+                baris.append(self._rows[lama][i])
+            else:
+                return None
+        return tuple(baris)
+
+    def terapkan_perubahan(self, row_id, operasi, rekaman=None):
+        """Terapkan perubahan satu baris; database hanya dibaca jika rekaman tidak cukup"""
+        if operasi == DELETE:
+            self.terapkan_baris(row_id, None)
+            return
+        # Dengan filter pencarian aktif, cocok tidaknya baris ditentukan oleh SQL
+        baris = self.baris_dari_rekaman(row_id, rekaman) if rekaman and not self.teks_cari else None
+        if baris is None:
+            self.perbarui_baris(row_id)
+        else:
+            self.terapkan_baris(row_id, baris)
+
+    # --- QAbstractTableModel ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.KOLOM)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        nilai = self._rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            tipe = self.TIPE_KOLOM.get(index.column())
+            return str(tipe(nilai) if tipe is not None and nilai is not None else nilai)
+        if role == Qt.UserRole:
+            return nilai
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.KOLOM[section]
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Dipanggil QTableView saat header diklik: urutkan di SQL, bukan di Python"""
+        turun = order == Qt.DescendingOrder
+        if (column, turun) == (self.urut_kolom, self.turun) and self._dimuat:
+            return
+        self.urut_kolom, self.turun = column, turun
+        if self._dimuat:
+            self.muat_ulang()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._habis
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._habis or not self._rows:
+            return
+        with database.cursor() as c:
+            halaman = self._query_halaman(c, self._rows[-1])
+        self._habis = len(halaman) < self.UKURAN_HALAMAN
+        if halaman:
+            awal = len(self._rows)
+            self.beginInsertRows(QModelIndex(), awal, awal + len(halaman) - 1)
+            self._rows.extend(halaman)
+            self.endInsertRows()
+
+
+class OrderTableModel(LazyTableModel):
+    KOLOM = ["ID", "Pelanggan", "Tanggal", "Status", "Biaya", "Layanan"]
+    KOLOM_SQL = ["o.id", "p.nama", "o.tanggal", "o.status", "o.biaya", "o.layanan"]
+    FROM = "FROM orders o JOIN pelanggan p ON o.pelanggan_id = p.id"
+
+    KOLOM_CARI = ["p.nama", "o.status", "o.layanan", "CAST(o.id AS TEXT)"]
+    KOLOM_REKAMAN = ["id", "pelanggan", "tanggal", "status", "biaya", "layanan"]
+    TIPE_KOLOM = {4: Rupiah}
+
+    def __init__(self, parent=None):
+        # Sama seperti daftar order lama: terbaru dulu
+        super().__init__(urut_kolom=2, turun=True, parent=parent)
+
+
+class PelangganTableModel(LazyTableModel):
+    KOLOM = ["ID", "Nama", "Alamat", "Telepon", "Email"]
+    KOLOM_SQL = ["id", "nama", "alamat", "telepon", "email"]
+    FROM = "FROM pelanggan"
+    KOLOM_CARI = ["CAST(id AS TEXT)", "nama", "alamat", "telepon", "email"]
+
+    def __init__(self, parent=None):
+        super().__init__(urut_kolom=1, parent=parent)
+
+    def _kondisi_cari(self):
+        # Index FTS trigram jika tersedia, LIKE biasa untuk teks pendek
+        kondisi, params = database.kondisi_cari_pelanggan(self.teks_cari)
+        return (kondisi, params) if kondisi else super()._kondisi_cari()
+
+
+class InventoryTableModel(LazyTableModel):
+    KOLOM = ["ID", "Nama Barang", "Stok", "Harga Beli"]
+    KOLOM_SQL = ["id", "nama", "stok", "harga_beli"]
+    TIPE_KOLOM = {3: Rupiah}
+    FROM = "FROM inventory"
+    KOLOM_CARI = ["nama"]
+
+    def __init__(self, parent=None):
+        super().__init__(urut_kolom=1, parent=parent)
@@ -0,0 +1,58 @@
+# uang.py
+import math
+
+
+def _bulat(nilai):
+    """Pembulatan setengah ke atas (menjauhi nol), sama seperti round() di SQLite"""
+    return int(math.floor(nilai + 0.5)) if nilai >= 0 else -int(math.floor(-nilai + 0.5))
+
+
+class Rupiah(int):
+    """Nominal uang dalam rupiah bulat, sama dengan kolom uang INTEGER di database.
+
+    str() memberi teks tampilan ("Rp 12,500") dan Rupiah("Rp 12,500") membacanya
+    kembali. Penjumlahan/pengurangan dengan bilangan bulat tetap Rupiah; perkalian
+    (misalnya dengan berat) dibulatkan ke rupiah terdekat.
+    """
+    __slots__ = ()
+
+    def __new__(cls, nilai=0):
+        if isinstance(nilai, str):
+            teks = nilai.replace("Rp", "").replace(",", "").strip()
+            nilai = float(teks) if teks else 0
+        if isinstance(nilai, float):
+            nilai = _bulat(nilai)
+        return super().__new__(cls, nilai or 0)
+
+    def __str__(self):
+        return f"Rp {int(self):,}"
+
+    def __repr__(self):
+        return f"Rupiah({int(self)})"
+
+    def __add__(self, other):
+        if isinstance(other, int):
+            return Rupiah(int(self) + int(other))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, int):
+            return Rupiah(int(self) - int(other))
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return Rupiah(int(other) - int(self))
+        return NotImplemented
+
+    def __neg__(self):
+        return Rupiah(-int(self))
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Rupiah(int(self) * other)
+        return NotImplemented
+
+    __rmul__ = __mul__